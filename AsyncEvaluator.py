@@ -0,0 +1,187 @@
+"""
+Fitness evaluation against simulators that answer asynchronously
+
+Created by Shinrod at 18/10/2026
+"""
+import asyncio
+from PopulationPlan import PopulationPlan
+import numpy as np
+
+
+class AsyncEvaluator:
+    """
+    Evaluate many Genome by running one episode per Genome, with one episode in flight per simulator.
+
+    A simulator is any object with two coroutines :
+    - reset() -> observation                        starts a new episode
+    - step(action) -> (observation, reward, done)   action is the array of the outputs of the Genome
+    For example a client of a simulator process, or an in-process stand-in (see the test at the end of this file).
+
+    While a simulator computes, the others keep going : every time some simulators have answered,
+    the Genome of all those episodes think at once, with one PopulationPlan.step().
+
+    The fitness of a Genome is the sum of the rewards of its episode.
+    An episode ends when the simulator says it is done, after max_steps steps, or after timeout seconds :
+    the Genome then keeps the rewards earned so far.
+    """
+
+    def __init__(self, simulators, max_steps : int = 1000, timeout : float = None):
+        """
+        Make a new AsyncEvaluator
+
+        :param simulators: the simulators, there are as many episodes in flight as simulators
+        :param max_steps: maximum # of steps of an episode
+        :param timeout: maximum duration of an episode in seconds, or None
+        """
+        self.simulators = list(simulators)
+        self.max_steps = max_steps
+        self.timeout = timeout
+
+        # Statistics of the last evaluation
+        self.timed_out = []
+        self.steps = 0
+        self.batches = 0
+
+    def evaluate(self, genomes):
+        """
+        Compute the fitness of every Genome, from synchronous code
+
+        :param genomes: list of Genome, they must all have the same # of inputs and outputs
+
+        :return: array of the fitness, in the order of genomes
+        """
+        return asyncio.run(self.evaluate_async(genomes))
+
+    async def evaluate_async(self, genomes):
+        """
+        Compute the fitness of every Genome
+
+        :param genomes: list of Genome, they must all have the same # of inputs and outputs
+
+        :return: array of the fitness, in the order of genomes
+        """
+        fitness = np.zeros(len(genomes))
+        self.timed_out = []
+        self.steps = 0
+        self.batches = 0
+        if not genomes:
+            return fitness
+
+        plan = PopulationPlan([genome.plan for genome in genomes])
+        loop = asyncio.get_running_loop()
+        waiting = iter(range(len(genomes)))
+        # Running call of each simulator -> [simulator, index of the Genome, # of steps, deadline]
+        pending = {}
+
+        def start(simulator):
+            # Start the episode of the next Genome on that simulator, if there is one left
+            i = next(waiting, None)
+            if i is None:
+                return
+            plan.reset([i])
+            deadline = None if self.timeout is None else loop.time() + self.timeout
+            episode = [simulator, i, 0, deadline]
+            pending[self.call(simulator.reset(), deadline)] = episode
+
+        for simulator in self.simulators:
+            start(simulator)
+
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            ready = []
+            observations = []
+            for task in done:
+                episode = pending.pop(task)
+                simulator, i = episode[0], episode[1]
+                try:
+                    result = task.result()
+                except asyncio.TimeoutError:
+                    self.timed_out.append(i)
+                    start(simulator)
+                    continue
+
+                if episode[2] == 0:
+                    # Answer to reset(), the steps are counted when they are sent
+                    observation = result
+                else:
+                    observation, reward, finished = result
+                    fitness[i] += reward
+                    if finished or episode[2] >= self.max_steps:
+                        start(simulator)
+                        continue
+                ready.append(episode)
+                observations.append(observation)
+
+            if ready:
+                # One forward pass for every episode waiting for an action
+                actions = plan.step(np.asarray(observations, dtype=np.float64), [episode[1] for episode in ready])
+                self.batches += 1
+                self.steps += len(ready)
+                for episode, action in zip(ready, actions):
+                    episode[2] += 1
+                    pending[self.call(episode[0].step(action), episode[3])] = episode
+
+        return fitness
+
+    @staticmethod
+    def call(coroutine, deadline):
+        """
+        Run a call to a simulator as a task, cancelled at the deadline of its episode
+
+        Used by :
+        AsyncEvaluator.evaluate_async()
+
+        :param coroutine: simulator.reset() or simulator.step(action)
+        :param deadline: time of the event loop when the episode times out, or None
+
+        :return: the task
+        """
+        if deadline is not None:
+            coroutine = asyncio.wait_for(coroutine, max(0.0, deadline - asyncio.get_running_loop().time()))
+        return asyncio.ensure_future(coroutine)
+
+
+# ---------------------------------------------------- TEST ------------------------------------------------------------
+if __name__ == '__main__':
+    import time
+    from Population import Population
+
+    class StandInSimulator:
+        """
+        In-process simulator answering after a random delay, like a simulator process behind a socket
+
+        The Genome sees a random target and earns 1 - |output - target| per step.
+        """
+
+        def __init__(self, seed, latency=0.002, episode_length=20, stall=None):
+            self.rng = np.random.default_rng(seed)
+            self.latency = latency
+            self.episode_length = episode_length
+            # Step at which the simulator stops answering, to test the timeouts
+            self.stall = stall
+            self.target = 0
+            self.t = 0
+
+        async def reset(self):
+            await asyncio.sleep(self.rng.uniform(0, self.latency))
+            self.t = 0
+            self.target = self.rng.random()
+            return [self.target]
+
+        async def step(self, action):
+            self.t += 1
+            await asyncio.sleep(3600 if self.t == self.stall else self.rng.uniform(0, self.latency))
+            reward = 1 - abs(action[0] - self.target)
+            self.target = self.rng.random()
+            return [self.target], reward, self.t >= self.episode_length
+
+    population = Population(200, 1, 1, 1, seed=0)
+    evaluator = AsyncEvaluator([StandInSimulator(k) for k in range(16)], max_steps=50, timeout=1.0)
+    start = time.perf_counter()
+    fitness = evaluator.evaluate(population.people)
+    print("fitness : best %.2f mean %.2f" % (fitness.max(), fitness.mean()))
+    print("%d steps in %d batches, %.2f s" % (evaluator.steps, evaluator.batches, time.perf_counter() - start))
+
+    evaluator = AsyncEvaluator([StandInSimulator(k, stall=5 if k == 0 else None) for k in range(4)], timeout=0.2)
+    fitness = evaluator.evaluate(population.people[:8])
+    print("timed out :", evaluator.timed_out, "fitness :", np.round(fitness, 2))
@@ -0,0 +1,384 @@
+"""
+Benchmarks of NEAT
+
+Run them with :
+python Benchmark.py [name of the benchmark ...] [--output results.json]
+
+Without a name, the suite is run : the main operations are timed on a grid of Genome and Population sizes
+(see python Benchmark.py --help) and the results are written in a JSON file, to compare two versions.
+
+Created by Shinrod at 18/10/2026
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+from Genome import Genome
+from InnovationRegistry import InnovationRegistry
+from Population import Population
+from Queue import PriorityQueue
+
+# Default grid of the suite
+CONNECTIONS = [10, 100, 1000, 10000]
+DEMOGRAPHY = [100, 1000, 10000, 100000]
+
+# Target of the cold start of an evaluation process, in seconds more than a process that only imports NumPy
+COLD_START_TARGET = 0.025
+
+
+def grow(genome, new_nodes, new_connections, rng=None):
+    """
+    Add hidden Nodes and Connections to a Genome so that it looks like an evolved one
+
+    :param genome: the Genome
+    :param new_nodes: # of mutation_add_node
+    :param new_connections: # of mutation_add_connection
+    :param rng: np.random.Generator of the mutations (default : a new one)
+
+    :return: the Genome
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    registry = registry_of(genome)
+    for _ in range(new_nodes):
+        genome.mutation_add_node(registry, rng)
+    for _ in range(new_connections):
+        genome.mutation_add_connection(registry, rng=rng)
+    return genome
+
+
+def registry_of(genome):
+    """
+    Make an InnovationRegistry that can be used to mutate a Genome made without a Population
+
+    :param genome: the Genome
+
+    :return: an InnovationRegistry giving new names and innovation numbers
+    """
+    return InnovationRegistry(max(node.name for node in genome.output + genome.hidden) + 1,
+                              max(con.innovation_number for con in genome.bias_connections
+                                  + genome.standard_connections) + 1)
+
+
+def genome_of_size(connections, rng=None):
+    """
+    Make a Genome with about that # of Connections, and about one hidden Node for 10 Connections
+
+    :param connections: # of Connections
+    :param rng: np.random.Generator of the Genome (default : a new one)
+
+    :return: the Genome
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    inputs = max(2, int(np.sqrt(connections)))
+    genome = Genome(inputs, 2, min(inputs, connections), rng=rng)
+    grow(genome, connections // 10, 0, rng)
+    registry = registry_of(genome)
+    while len(genome.standard_connections) + len(genome.bias_connections) < connections:
+        if genome.mutation_add_connection(registry, rng=rng) is None:
+            break
+    return genome
+
+
+def measure(function, setup=None, duration=0.2, max_calls=100000):
+    """
+    Time a function
+
+    :param function: the timed function
+    :param setup: function called (not timed) before each call, its result is given to the timed function
+    :param duration: the function is called until that many seconds have been spent in it (at least once)
+    :param max_calls: maximum # of calls
+
+    :return: seconds per call
+    """
+    total = 0
+    calls = 0
+    while (total < duration and calls < max_calls) or calls == 0:
+        arguments = setup() if setup is not None else ()
+        start = time.perf_counter()
+        function(*arguments)
+        total += time.perf_counter() - start
+        calls += 1
+    return total / calls
+
+
+# ----------------------------------------------------- SUITE ----------------------------------------------------------
+def benchmark_suite(connections=CONNECTIONS, demography=DEMOGRAPHY):
+    """
+    Time the main operations on a grid of Genome and Population sizes
+
+    :param connections: # of Connections of the Genome
+    :param demography: # of Genome of the Population
+
+    :return: list of results, one dict per (operation, size)
+    """
+    rng = np.random.default_rng(0)
+    results = []
+
+    def record(operation, size, seconds):
+        results.append({'operation': operation, **size, 'seconds per call': seconds})
+
+    for n in connections:
+        genome = genome_of_size(n, rng)
+        size = {'connections': len(genome.standard_connections) + len(genome.bias_connections),
+                'nodes': len(genome.input) + 1 + len(genome.hidden) + len(genome.output)}
+        inputs = rng.random(len(genome.input))
+        registry = registry_of(genome)
+
+        genome.think(inputs)
+        record('Genome.think', size, measure(lambda: genome.think(inputs)))
+        record('Genome.plan (compile)', size, measure(lambda: genome.plan, setup=lambda: genome.invalidate_plan() or ()))
+        record('Genome.clone', size, measure(genome.clone))
+
+        def clone():
+            # Without its Plan : only the mutations are timed, not the updates of the Plan (see benchmark_topology)
+            copy = genome.clone()
+            copy.invalidate_plan()
+            return copy,
+
+        record('Genome.mutate', size, measure(lambda copy: copy.mutate(registry, rng), setup=clone))
+        record('Genome.mutation_add_connection', size,
+               measure(lambda copy: copy.mutation_add_connection(registry, rng=rng), setup=clone))
+        record('Genome.mutation_add_node', size, measure(lambda copy: copy.mutation_add_node(registry, rng), setup=clone))
+
+        # A PriorityQueue with as many items as that Genome has Connections
+        items = [object() for _ in range(size['connections'])]
+        priorities = rng.integers(10, size=len(items)).tolist()
+
+        def fill():
+            queue = PriorityQueue()
+            for item, priority in zip(items, priorities):
+                queue.put(item, priority)
+            return queue
+
+        def empty(queue):
+            while queue:
+                queue.get()
+
+        record('PriorityQueue.put (all items)', size, measure(fill))
+        record('PriorityQueue.get (all items)', size, measure(empty, setup=lambda: (fill(),)))
+
+    for n in demography:
+        population = Population(n, 8, 2, 8, seed=0)
+        record('Population.mutate', {'demography': n}, measure(population.mutate, duration=1.0))
+    return results
+
+
+# ---------------------------------------------------- MEMORY ----------------------------------------------------------
+def benchmark_memory(demography=10000, inputs=8, outputs=2, new_nodes=5, new_connections=10):
+    """
+    Bytes per Genome of a Population stored as objects and stored in a GenomeTable
+
+    :return: dict of the results
+    """
+    rng = np.random.default_rng(0)
+    tracemalloc.start()
+    population = Population(demography, inputs, outputs, inputs, seed=0)
+    for genome in population.people:
+        grow(genome, new_nodes, new_connections, rng)
+    objects = tracemalloc.get_traced_memory()[0]
+
+    table = population.compact()
+    # The Nodes and their Connections reference each other
+    del population
+    gc.collect()
+    compact = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return {'demography': demography,
+            'connections per genome': int(table.con_offsets[-1]) / demography,
+            'objects bytes per genome': objects / demography,
+            'table bytes per genome': compact / demography,
+            'table array bytes per genome': table.nbytes / demography}
+
+
+# ---------------------------------------------------- CLONE -----------------------------------------------------------
+def benchmark_clone(inputs=50, outputs=10, new_nodes=200, new_connections=2000, duration=1.0):
+    """
+    # of Genome.clone() per second for a Genome with thousands of Connections
+
+    :return: dict of the results
+    """
+    rng = np.random.default_rng(0)
+    genome = grow(Genome(inputs, outputs, inputs, rng=rng), new_nodes, new_connections, rng)
+
+    clones = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        genome.clone()
+        clones += 1
+    elapsed = time.perf_counter() - start
+
+    return {'connections': len(genome.standard_connections) + len(genome.bias_connections),
+            'nodes': len(genome.input) + 1 + len(genome.hidden) + len(genome.output),
+            'clones per second': clones / elapsed}
+
+
+# -------------------------------------------------- CROSSOVER ---------------------------------------------------------
+def benchmark_crossover(demography=1000, inputs=8, outputs=2, new_nodes=10, new_connections=30):
+    """
+    # of offspring per second made by Genome.crossover() and by Population.crossover()
+
+    :return: dict of the results
+    """
+    rng = np.random.default_rng(0)
+    population = Population(demography, inputs, outputs, inputs, seed=0)
+    for genome in population.people:
+        for _ in range(new_nodes):
+            genome.mutation_add_node(population.registry, rng)
+        for _ in range(new_connections):
+            genome.mutation_add_connection(population.registry, rng=rng)
+    fitness = rng.random(demography)
+    pairs = rng.integers(demography, size=(demography, 2))
+
+    start = time.perf_counter()
+    for a, b in pairs:
+        fitter = population.people[a] if fitness[a] >= fitness[b] else population.people[b]
+        population.people[a].crossover(population.people[b], fitter, rng)
+    genome_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    children = population.crossover(pairs, fitness)
+    table_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Population.from_table(children)
+    decode_time = time.perf_counter() - start
+
+    return {'demography': demography,
+            'connections per genome': int(children.con_offsets[-1]) / demography,
+            'Genome.crossover offspring per second': demography / genome_time,
+            'Population.crossover offspring per second': demography / table_time,
+            'Population.crossover + decode offspring per second': demography / (table_time + decode_time)}
+
+
+# --------------------------------------------------- TOPOLOGY ---------------------------------------------------------
+def benchmark_topology(connections=CONNECTIONS):
+    """
+    Cost of a structural mutation followed by a compilation :
+    - when the Genome keeps its levels and recurrent Connections up to date (see Genome.insert()),
+      and when they are found again from scratch (see Genome.sort())
+    - when the Plan of the Genome is updated (see Plan.update()), and when it is compiled again
+
+    :param connections: # of Connections of the Genome
+
+    :return: list of results, one dict per Genome
+    """
+    rng = np.random.default_rng(0)
+    results = []
+    for n in connections:
+        genome = genome_of_size(n, rng)
+        genome.plan
+        registry = registry_of(genome)
+
+        def mutate(clone, seed):
+            mutation_rng = np.random.default_rng(seed)
+            clone.mutation_add_node(registry, mutation_rng)
+            clone.mutation_add_connection(registry, rng=mutation_rng)
+            return clone
+
+        def with_plan():
+            return genome.clone(), int(rng.integers(2 ** 32))
+
+        def without_plan():
+            clone = genome.clone()
+            clone.invalidate_plan()
+            return clone, int(rng.integers(2 ** 32))
+
+        def from_scratch():
+            clone, seed = without_plan()
+            for con in clone.bias_connections + clone.standard_connections:
+                con.recurrent = None
+            clone._sorted = False
+            return clone, seed
+
+        result = {'connections': len(genome.standard_connections) + len(genome.bias_connections),
+                  'nodes': len(genome.input) + 1 + len(genome.hidden) + len(genome.output),
+                  'mutation (incremental)': measure(mutate, setup=without_plan),
+                  'mutation + sort': measure(lambda clone, seed: mutate(clone, seed).sort(), setup=from_scratch),
+                  'mutation + update of the plan': measure(lambda clone, seed: mutate(clone, seed).plan,
+                                                           setup=with_plan),
+                  'mutation + compile': measure(lambda clone, seed: mutate(clone, seed).plan, setup=without_plan),
+                  'mutation + sort + compile': measure(lambda clone, seed: mutate(clone, seed).plan,
+                                                       setup=from_scratch)}
+        result['speedup of the topology'] = result['mutation + sort'] / result['mutation (incremental)']
+        result['speedup of the plan'] = result['mutation + compile'] / result['mutation + update of the plan']
+        results.append(result)
+    return results
+
+
+# ---------------------------------------------------- STARTUP ---------------------------------------------------------
+def benchmark_startup(runs=7):
+    """
+    Cold start time of a new Python process importing what an evaluation process of
+    Population.evaluate_parallel() imports, compared to COLD_START_TARGET
+
+    Each time is the median of runs new processes, it includes the start of the interpreter.
+
+    :return: dict of the results
+    """
+    entry_points = {'python': 'pass',
+                    'numpy': 'import numpy',
+                    'Worker (Network)': 'import Worker, Network',
+                    'Worker (CompactGenome)': 'import Worker, Config, CompactGenome, Genome',
+                    'Population': 'import Population'}
+
+    # The processes run in the directory of the modules, wherever the benchmark is started from
+    directory = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for name, code in entry_points.items():
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], check=True, cwd=directory)
+            times.append(time.perf_counter() - start)
+        results[name] = statistics.median(times)
+
+    for name in ('Worker (Network)', 'Worker (CompactGenome)', 'Population'):
+        results[name + ' over numpy'] = results[name] - results['numpy']
+    results['target over numpy'] = COLD_START_TARGET
+    results['Worker (Network) within target'] = results['Worker (Network) over numpy'] <= COLD_START_TARGET
+    return results
+
+
+BENCHMARKS = {'suite': benchmark_suite,
+              'memory': benchmark_memory,
+              'clone': benchmark_clone,
+              'crossover': benchmark_crossover,
+              'topology': benchmark_topology,
+              'startup': benchmark_startup}
+
+
+# ---------------------------------------------------- MAIN ------------------------------------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks of NEAT")
+    parser.add_argument('benchmarks', nargs='*', help="amongst " + ", ".join(BENCHMARKS) + " (default : suite)")
+    parser.add_argument('--output', default='benchmark.json', help="JSON file where the results are written")
+    parser.add_argument('--connections', nargs='+', type=int, default=CONNECTIONS,
+                        help="# of connections of the genomes of the suite")
+    parser.add_argument('--demography', nargs='+', type=int, default=DEMOGRAPHY,
+                        help="# of genomes of the populations of the suite")
+    arguments = parser.parse_args()
+    for name in arguments.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error("unknown benchmark " + name)
+
+    results = {'python': platform.python_version(), 'numpy': np.__version__, 'benchmarks': {}}
+    for name in arguments.benchmarks or ['suite']:
+        if name == 'suite':
+            result = benchmark_suite(arguments.connections, arguments.demography)
+        else:
+            result = BENCHMARKS[name]()
+        results['benchmarks'][name] = result
+        print(name, json.dumps(result, indent=1))
+
+    with open(arguments.output, 'w') as file:
+        json.dump(results, file, indent=1)
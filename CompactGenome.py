@@ -0,0 +1,80 @@
+"""
+Array-backed copy of a Genome
+
+Created by Shinrod at 18/10/2026
+"""
+from hashlib import blake2b
+import numpy as np
+
+
+class CompactGenome:
+    """
+    A Genome stored as parallel NumPy arrays instead of Node and Connection objects.
+
+    The Nodes are numbered in this order : inputs, bias, hidden, outputs.
+    Only the names of the hidden Nodes are stored, the others are deduced from their index.
+    The Connections are stored in this order : bias connections, standard connections.
+    A missing innovation number or name is stored as -1.
+    The recurrent flag of each Connection (see Genome.sort()) is stored as 1 (recurrent), 0 (feed forward),
+    or -1 if it is unknown, which is always the case for a disabled Connection.
+
+    Made by Genome.encode() and turned back into a Genome by Genome.decode().
+    """
+
+    __slots__ = ('inputs', 'outputs', 'hidden', 'con_in', 'con_out', 'weights', 'enabled', 'innovations', 'recurrent')
+
+    def __init__(self, inputs : int, outputs : int, hidden, con_in, con_out, weights, enabled, innovations,
+                 recurrent = None):
+        """
+        Make a new CompactGenome
+
+        :param inputs: # of inputs
+        :param outputs: # of outputs
+        :param hidden: names of the hidden Nodes
+        :param con_in: index of the input Node of each Connection
+        :param con_out: index of the output Node of each Connection
+        :param weights: weight of each Connection
+        :param enabled: True if the Connection is enabled
+        :param innovations: innovation number of each Connection
+        :param recurrent: 1, 0 or -1 for each Connection (default : all unknown)
+        """
+        self.inputs = inputs
+        self.outputs = outputs
+        self.hidden = np.asarray(hidden, dtype=np.int64)
+        self.con_in = np.asarray(con_in, dtype=np.int32)
+        self.con_out = np.asarray(con_out, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.enabled = np.asarray(enabled, dtype=bool)
+        self.innovations = np.asarray(innovations, dtype=np.int64)
+        self.recurrent = np.full(len(self.con_in), -1, dtype=np.int8) if recurrent is None \
+            else np.asarray(recurrent, dtype=np.int8)
+
+    @property
+    def nbytes(self):
+        """
+        # of bytes used by the arrays
+        """
+        return sum(array.nbytes for array in (self.hidden, self.con_in, self.con_out,
+                                              self.weights, self.enabled, self.innovations, self.recurrent))
+
+    def content_hash(self):
+        """
+        Hash of the (innovation number, input name, output name, weight, enabled, recurrent) of every Connection
+
+        The Connections are sorted by innovation number and the Nodes are identified by their name,
+        so the hash doesn't depend on the order of the Nodes and Connections.
+
+        :return: a 16 bytes digest
+        """
+        # Name of every Node : inputs, bias, hidden, outputs
+        names = np.concatenate([np.arange(self.inputs + 1), self.hidden,
+                                np.arange(self.inputs + 1, self.inputs + 1 + self.outputs)])
+        order = np.argsort(self.innovations, kind='stable')
+        digest = blake2b(np.array([self.inputs, self.outputs], dtype=np.int64).tobytes(), digest_size=16)
+        digest.update(self.innovations[order].tobytes())
+        digest.update(names[self.con_in[order]].tobytes())
+        digest.update(names[self.con_out[order]].tobytes())
+        digest.update(self.weights[order].tobytes())
+        digest.update(self.enabled[order].tobytes())
+        digest.update(np.where(self.enabled, self.recurrent, -1).astype(np.int8)[order].tobytes())
+        return digest.digest()
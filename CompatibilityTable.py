@@ -0,0 +1,146 @@
+"""
+Compatibility distance between many genomes and the species representatives
+
+Created by Shinrod at 18/10/2026
+"""
+from Config import Config
+import numpy as np
+
+
+class CompatibilityTable:
+    """
+    Genes of the species representatives.
+
+    The innovation numbers are replaced by their rank amongst the innovation numbers met by the table
+    (see CompatibilityTable.rank()) : the memory doesn't grow with the # of innovations since the beginning
+    of the evolution, only with the # of different genes in the Population.
+    To compare genomes with a block of representatives, row r of a dense array tells which ranks the r-th
+    representative has, so matching the genes of a genome with every representative is a single array lookup.
+    The blocks are small enough that no temporary array has more than BLOCK elements.
+    """
+
+    # Maximum # of elements of the temporary arrays of CompatibilityTable.distances()
+    BLOCK = 1 << 22
+
+    def __init__(self, innovations, config : Config = None):
+        """
+        Make an empty CompatibilityTable
+
+        :param innovations: sorted array of every innovation number the genomes and the representatives can have
+        :param config: parameters of the compatibility distance (default : Config.default())
+        """
+        self.config = config or Config.default()
+        self.innovations = np.asarray(innovations, dtype=np.int64)
+        # Sorted ranks and weights of the genes of each representative
+        self.ranks = []
+        self.weights = []
+
+    @property
+    def size(self):
+        """
+        :return: # of representatives
+        """
+        return len(self.ranks)
+
+    def rank(self, innovations):
+        """
+        Rank of innovation numbers amongst the ones of this table
+
+        :param innovations: innovation numbers, they must all be in self.innovations
+
+        :return: array of the ranks
+        """
+        return np.searchsorted(self.innovations, innovations)
+
+    def add(self, innovations, weights):
+        """
+        Add a representative
+
+        :param innovations: innovation numbers of its genes, sorted
+        :param weights: weights of its genes
+
+        :return: the index of that representative
+        """
+        self.ranks.append(self.rank(innovations))
+        self.weights.append(np.asarray(weights, dtype=np.float64))
+        return self.size - 1
+
+    def distances(self, ranks, weights, lengths, begin : int = 0, end : int = None):
+        """
+        Compatibility distance between genomes and the representatives begin, begin + 1, ..., end - 1
+
+        :param ranks: array (# genomes, L) of the sorted ranks of the innovation numbers of each genome,
+                      padded with -1
+        :param weights: array (# genomes, L) of the weights of each genome
+        :param lengths: # of genes of each genome
+        :param begin: first representative
+        :param end: last representative + 1 (default : self.size)
+
+        :return: array (# representatives, # genomes) of the distances
+        """
+        end = self.size if end is None else end
+        n, width = ranks.shape
+        valid = ranks >= 0
+        index = np.where(valid, ranks, 0)
+        last = np.where(lengths > 0, ranks[np.arange(n), np.maximum(lengths - 1, 0)], -1)
+        # Ranks of all the genomes in a single sorted array, each genome shifted past the previous one :
+        # the # of genes of every genome up to some rank is a single np.searchsorted
+        shift = len(self.innovations) + 1
+        flat = (np.where(valid, ranks, len(self.innovations)) + shift * np.arange(n)[:, None]).ravel()
+        config = self.config
+
+        result = np.empty((end - begin, n))
+        block = max(1, CompatibilityTable.BLOCK // max(len(self.innovations), n * width, 1))
+        for first in range(begin, end, block):
+            rows = range(first, min(first + block, end))
+            present = np.zeros((len(rows), len(self.innovations)), dtype=bool)
+            table = np.zeros((len(rows), len(self.innovations)))
+            for k, r in enumerate(rows):
+                present[k, self.ranks[r]] = True
+                table[k, self.ranks[r]] = self.weights[r]
+            length = np.array([len(self.ranks[r]) for r in rows], dtype=np.int64)
+            representative_last = np.array([self.ranks[r][-1] if len(self.ranks[r]) else -1 for r in rows],
+                                           dtype=np.int64)
+
+            # Shape (# representatives of the block, # genomes, L)
+            matching = present[:, index]
+            matching &= valid
+            difference = table[:, index]
+            difference -= weights
+            np.abs(difference, out=difference)
+            difference *= matching
+            n_matching = np.count_nonzero(matching, axis=2)
+            weight_difference = difference.sum(axis=2) / np.maximum(n_matching, 1)
+
+            # Genes of the genome after the last gene of the representative, and the other way around
+            below = np.searchsorted(flat, representative_last[:, None] + shift * np.arange(n), side='right')
+            excess = lengths - (below - width * np.arange(n))
+            representative_excess = length[:, None] - np.array([np.searchsorted(self.ranks[r], last, side='right')
+                                                                for r in rows]).reshape(len(rows), n)
+            disjoint = lengths - n_matching - excess + length[:, None] - n_matching - representative_excess
+            excess += representative_excess
+
+            size = np.maximum(lengths, length[:, None])
+            size = np.where(size < config.COMPATIBILITY_SMALL_GENOME, 1, size)
+            result[first - begin:first - begin + len(rows)] = \
+                (config.COMPATIBILITY_EXCESS * excess + config.COMPATIBILITY_DISJOINT * disjoint) / size \
+                + config.COMPATIBILITY_WEIGHT * weight_difference
+        return result
+
+    @staticmethod
+    def pad(genes):
+        """
+        Pack the genes of many genomes in padded arrays
+
+        :param genes: list of (sorted innovation numbers or ranks, weights), one per genome
+
+        :return: (innovation numbers padded with -1, weights padded with 0, # of genes of each genome)
+        """
+        lengths = np.array([len(innovations) for innovations, _ in genes], dtype=np.int64)
+        width = lengths.max(initial=0)
+        innovations = np.full((len(genes), width), -1, dtype=np.int64)
+        weights = np.zeros((len(genes), width))
+        for i, (genome_innovations, genome_weights) in enumerate(genes):
+            innovations[i, :len(genome_innovations)] = genome_innovations
+            weights[i, :len(genome_weights)] = genome_weights
+        return innovations, weights, lengths
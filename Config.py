@@ -0,0 +1,100 @@
+"""
+Parameters of NEAT, loaded once and passed explicitly
+
+Created by Shinrod at 18/10/2026
+"""
+import Params
+
+
+class Config:
+    """
+    Values of the parameters of Params, as attributes : config.MUTATION_NEW_WEIGHT, config.SURVIVAL_RATE, ...
+
+    The defaults are read from Params when the Config is made, then the Config is given to the Population,
+    which gives it to its Genome and to the evaluation processes.
+    So every process uses the same parameters, even if Params was changed in one of them.
+
+    Use it like this :
+    config = Config(SURVIVAL_RATE=0.3)              or          config = Config.load('config.json')
+    population = Population(demography, inputs, outputs, config=config)
+    """
+
+    # Names in Params that are constants, not parameters
+    CONSTANTS = ('SENSOR', 'HIDDEN', 'OUTPUT')
+
+    # Config made from the defaults of Params, see Config.default()
+    _default = None
+
+    def __init__(self, **values):
+        """
+        Make a new Config
+
+        SLIGHT_WEIGHT_MUTATION_STD_VAR is computed again from the bounds and the multiplier, unless it is given.
+
+        :param values: parameters that don't take their default value in Params
+        """
+        defaults = Config.defaults()
+        unknown = set(values) - set(defaults)
+        if unknown:
+            raise KeyError("Unknown parameters : " + ', '.join(sorted(unknown)))
+
+        self.__dict__.update(defaults)
+        self.__dict__.update(values)
+        if 'SLIGHT_WEIGHT_MUTATION_STD_VAR' not in values:
+            self.SLIGHT_WEIGHT_MUTATION_STD_VAR = (self.WEIGHT_UPPER_BOUND - self.WEIGHT_LOWER_BOUND) / 2 \
+                                                  * self.SLIGHT_WEIGHT_MUTATION_STD_VAR_MULTIPLIER
+
+    @staticmethod
+    def defaults():
+        """
+        Current value of every parameter of Params
+
+        :return: dict of name -> value
+        """
+        return {name: value for name, value in vars(Params).items()
+                if name.isupper() and name not in Config.CONSTANTS}
+
+    @classmethod
+    def default(cls):
+        """
+        Config used when none is given, made the first time it is needed
+
+        :return: the default Config
+        """
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def values(self):
+        """
+        Every parameter of this Config
+
+        :return: dict of name -> value
+        """
+        return dict(self.__dict__)
+
+    # ------------------------------------------------ FILE ------------------------------------------------------------
+    def save(self, path):
+        """
+        Save this Config in a JSON file
+
+        :param path: path of the file
+
+        :return: None
+        """
+        import json
+        with open(path, 'w') as file:
+            json.dump(self.values(), file, indent=4)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a Config saved by Config.save(), the missing parameters take their default value
+
+        :param path: path of the file
+
+        :return: the Config
+        """
+        import json
+        with open(path) as file:
+            return cls(**json.load(file))
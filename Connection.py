@@ -1,8 +1,8 @@
 """
 Created by Shinrod at 08/05/2020
 """
+from Config import Config
 from Node import Node
-from Params import *
 import numpy as np
 
 
@@ -13,62 +13,79 @@ class Connection:
     As described in http://nn.cs.utexas.edu/downloads/papers/stanley.ec02.pdf (Fig. 2)
     """
 
-    global_innovation_number = 0
+    # No __dict__ : a Connection is created for every gene of every Genome
+    __slots__ = ('node_in', 'node_out', 'weight', 'enabled', 'innovation_number', 'recurrent')
 
-    def __init__(self, node_in : Node, node_out : Node, weight = None, innovation_number = None):
+    def __init__(self, node_in : Node, node_out : Node, weight = None, innovation_number = None,
+                 config : Config = None, rng : np.random.Generator = None):
         """
         Make a new Connection between two Nodes
 
         :param node_in: input Node
         :param node_out: output Node
-        :param weight: weight of the Connection
+        :param weight: weight of the Connection (default : random)
         :param innovation_number: historical origin of the connection
+        :param config: parameters used to draw the random weight (default : Config.default())
+        :param rng: random generator used to draw the random weight (default : a new one)
         """
         self.node_in = node_in
         self.node_in.outward_connections.append(self)
+        self.node_in.linked.add(node_out.name)
         self.node_out = node_out
         self.node_out.inward_connections.append(self)
 
         if weight is None:
-            self.randomize_weight()
+            self.randomize_weight(config or Config.default(), np.random.default_rng() if rng is None else rng)
         else:
             self.weight = weight
 
         self.enabled = True
         self.innovation_number = innovation_number
+        # True if it closes a cycle, False if it is feed forward, None until it is inserted by Genome.sort()
+        self.recurrent = None
 
     # ----------------------------------------------- MUTATE -----------------------------------------------------------
-    def mutate(self):
+    def mutate(self, config : Config, rng : np.random.Generator):
         """
         Change the weight of this Connection
+
+        :param config: parameters of the mutation
+        :param rng: random generator of the Genome
         """
-        if np.random.rand() < MUTATION_NEW_WEIGHT:
-            self.randomize_weight()
+        if rng.random() < config.MUTATION_NEW_WEIGHT:
+            self.randomize_weight(config, rng)
         else:
-            self.change_slightly_weight()
+            self.change_slightly_weight(config, rng)
 
 
     # ------------------------------------------------ TOOL ------------------------------------------------------------
-    def randomize_weight(self):
+    def randomize_weight(self, config : Config, rng : np.random.Generator):
         """
-        Change the weight for a random weight between Params.WEIGHT_LOWER_BOUND and Params.WEIGHT_UPPER_BOUND
+        Change the weight for a random weight between config.WEIGHT_LOWER_BOUND and config.WEIGHT_UPPER_BOUND
+
+        :param config: parameters giving the bounds
+        :param rng: random generator of the Genome
         """
-        self.weight = (WEIGHT_UPPER_BOUND - WEIGHT_LOWER_BOUND) * np.random.rand() + WEIGHT_LOWER_BOUND
+        self.weight = (config.WEIGHT_UPPER_BOUND - config.WEIGHT_LOWER_BOUND) * rng.random() \
+                      + config.WEIGHT_LOWER_BOUND
 
-    def change_slightly_weight(self):
+    def change_slightly_weight(self, config : Config, rng : np.random.Generator):
         """
         Slightly changes the weight of this Connection.
 
         It changes according to a normal distribution
+
+        :param config: parameters giving the standard deviation and the bounds
+        :param rng: random generator of the Genome
         """
-        self.weight += np.random.normal(0, SLIGHT_WEIGHT_MUTATION_STD_VAR)
+        self.weight += rng.normal(0, config.SLIGHT_WEIGHT_MUTATION_STD_VAR)
 
         # Make sure the weight stays between the bounds
-        if self.weight > WEIGHT_UPPER_BOUND:
-            self.weight = WEIGHT_UPPER_BOUND
+        if self.weight > config.WEIGHT_UPPER_BOUND:
+            self.weight = config.WEIGHT_UPPER_BOUND
 
-        elif self.weight < WEIGHT_LOWER_BOUND:
-            self.weight = WEIGHT_LOWER_BOUND
+        elif self.weight < config.WEIGHT_LOWER_BOUND:
+            self.weight = config.WEIGHT_LOWER_BOUND
 
 
     def clone(self, node_in, node_out):
@@ -83,7 +100,10 @@ class Connection:
 
         :return: a clone of this Connection
         """
-        return Connection(node_in, node_out, self.weight, self.innovation_number)
+        clone = Connection(node_in, node_out, self.weight, self.innovation_number)
+        clone.enabled = self.enabled
+        clone.recurrent = self.recurrent
+        return clone
 
     def __eq__(self, other):
         """
@@ -92,10 +112,6 @@ class Connection:
         Called by :
         self == other
 
-        Used by :
-        Genome.mutation_add_connection()
-        Genome.mutation_add_node()
-
         :param other: the other Connection
 
         :return: True if the two are linking the same Nodes, False otherwise
@@ -0,0 +1,90 @@
+"""
+Fitness memoization
+
+Created by Shinrod at 18/10/2026
+"""
+from collections import OrderedDict
+from Config import Config
+
+
+class FitnessCache:
+    """
+    Least recently used cache of fitness, keyed by Genome.content_hash()
+
+    The cached fitness is only valid for the fitness function it was computed with,
+    and only if that function is deterministic.
+    """
+
+    def __init__(self, size : int = None, config : Config = None):
+        """
+        Make a new FitnessCache
+
+        :param size: maximum # of fitness remembered (default : config.FITNESS_CACHE_SIZE)
+        :param config: parameters giving the default size (default : Config.default())
+        """
+        self.size = (config or Config.default()).FITNESS_CACHE_SIZE if size is None else size
+        self.fitness = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Get a cached fitness
+
+        :param key: Genome.content_hash()
+
+        :return: the fitness, or None if it isn't cached
+        """
+        fitness = self.fitness.get(key)
+        if fitness is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.fitness.move_to_end(key)
+        return fitness
+
+    def get_many(self, keys):
+        """
+        Get the cached fitness of many Genome
+
+        A key missing from the cache counts as a miss the first time it is seen, and as a hit after that,
+        because its fitness is only computed once.
+
+        :param keys: Genome.content_hash() of each Genome
+
+        :return: (fitness of each Genome or None, dict of each missing key to the index where it is first seen)
+        """
+        fitness = []
+        missing = {}
+        for i, key in enumerate(keys):
+            if key in missing:
+                self.hits += 1
+                fitness.append(None)
+            else:
+                fitness.append(self.get(key))
+                if fitness[-1] is None:
+                    missing[key] = i
+        return fitness, missing
+
+    def put(self, key, fitness):
+        """
+        Remember a fitness
+
+        :param key: Genome.content_hash()
+        :param fitness: the fitness of that Genome
+        """
+        self.fitness[key] = fitness
+        self.fitness.move_to_end(key)
+        if len(self.fitness) > self.size:
+            self.fitness.popitem(last=False)
+
+    def clear(self):
+        """
+        Forget every fitness and reset the counters
+        """
+        self.fitness.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.fitness)
@@ -1,14 +1,17 @@
 """
-Todo : Identify recurrent connections
-Currently recurrent connections are defined by the calling order in the 'think' method
+Recurrent connections are the connections closing a cycle with the feed forward connections, see Genome.sort().
+They read the value their input node had at the previous call to 'think' or 'step'.
 
 Created by Shinrod at 08/05/2020
 """
+from CompactGenome import CompactGenome
+from Config import Config
 from Connection import Connection
+from InnovationRegistry import InnovationRegistry
+from Network import Network
 from Node import Node
-from Params import *
+from Plan import Plan
 import numpy as np
-from Queue import PriorityQueue
 
 
 
@@ -23,7 +26,9 @@ class Genome:
                  inputs : int = 1,
                  outputs : int = 1,
                  first_connections = 1,
-                 innovation_history = None,
+                 registry : InnovationRegistry = None,
+                 config : Config = None,
+                 rng : np.random.Generator = None,
                  __other = None):
         """
         Make a new Genome.
@@ -41,11 +46,22 @@ class Genome:
         :param inputs: # of inputs
         :param outputs: # of outputs
         :param first_connections: # of connections the NN is starting with (must be between 0 and inputs included)
+        :param registry: InnovationRegistry shared by the Population (by default the Genome has its own)
+        :param config: parameters shared by the Population (default : Config.default())
+        :param rng: random generator of the first weights and connections (default : a new one)
 
         :param __other: Use that parameter alone to clone a Genome
         """
+        # Compiled evaluation plan, built on the first call to 'think'
+        self._plan = None
+        # Content hash, computed on the first call to 'content_hash'
+        self._hash = None
+        # True while the levels of the Nodes and the recurrent flags of the Connections are up to date
+        self._sorted = False
+
         if __other is None:
             # Make a new Genome
+            self.config = config or Config.default()
             self.input = [Node(Node.SENSOR, i) for i in range(inputs)]
             self.bias = Node(Node.SENSOR, inputs)
             self.output = [Node(Node.OUTPUT, inputs + 1 + i) for i in range(outputs)]
@@ -53,32 +69,41 @@ class Genome:
             self.standard_connections = []
             self.bias_connections = []
 
+            if registry is None:
+                registry = InnovationRegistry(inputs + 1 + outputs)
+            if rng is None:
+                rng = np.random.default_rng()
+
             # Link the bias to the outputs
             for i, output in enumerate(self.output):
-                self.bias_connections.append(Connection(self.bias, output, innovation_number=None))
+                self.bias_connections.append(Connection(self.bias, output,
+                                                        innovation_number=registry.connection(self.bias, output),
+                                                        config=self.config, rng=rng))
 
             # Add the # of connections we want the genome to start with
-            if innovation_history is None:
-                innovation_history = []
             for _ in range(first_connections):
-                self.mutation_add_connection(innovation_history, first_node_pool=self.input)
+                self.mutation_add_connection(registry, first_node_pool=self.input, rng=rng)
         else:
             # Clone __other
+            self.config = __other.config
             self.input = [node.clone() for node in __other.input]
+            self.bias = __other.bias.clone()
             self.hidden = [node.clone() for node in __other.hidden]
             self.output = [node.clone() for node in __other.output]
 
-            # Make the connections
-            old_nodes = __other.input + __other.hidden + __other.output
-            nodes = self.input + self.hidden + self.output
-            self.connections = []
+            # Map every old Node to its clone
+            old_nodes = __other.input + [__other.bias] + __other.hidden + __other.output
+            nodes = self.input + [self.bias] + self.hidden + self.output
+            clone_of = {id(old_node): node for old_node, node in zip(old_nodes, nodes)}
 
-            # Go through all the nodes, find the old connection and make a new one using the new nodes
-            for i, old_node_in in enumerate(old_nodes):
-                node_in = nodes[i]
-                for old_con in old_node_in.outward_connections:
-                    node_out = nodes[nodes.index(old_con.node_out)]
-                    self.connections.append(old_con.clone(node_in, node_out))
+            # Make the connections, in the same order as the old ones
+            self.standard_connections = [con.clone(clone_of[id(con.node_in)], clone_of[id(con.node_out)])
+                                         for con in __other.standard_connections]
+            self.bias_connections = [con.clone(clone_of[id(con.node_in)], clone_of[id(con.node_out)])
+                                     for con in __other.bias_connections]
+            self._hash = __other._hash
+            self._sorted = __other._sorted
+            self._plan = None if __other._plan is None else __other._plan.copy()
 
 
     # ----------------------------------------------- THINK ------------------------------------------------------------
@@ -90,30 +115,93 @@ class Genome:
 
         :return: the result of the neural network evaluation
         """
-        # 1st step : inputs & bias
-        queue = PriorityQueue()
-        for i, node in enumerate(self.input):
-            node.value = inputs[i]
-            queue.put(node, 0)
-        self.bias.value = 1
-        queue.put(self.bias, 0)
+        if self.config.DEBUG:
+            nodes = self.input + [self.bias] + self.hidden + self.output
+            print(*[nodes[self.plan.kept[i]] for i in self.plan.order])
+        return self.plan.think(inputs)
+
+    def think_batch(self, inputs):
+        """
+        Use the neural network on many samples at once
+
+        Each row gives the same result as 'think' would give with that row.
+
+        :param inputs: array of shape (n_samples, # of inputs)
+
+        :return: array of shape (n_samples, # of outputs)
+        """
+        return self.plan.think_batch(inputs)
+
+    def step(self, inputs):
+        """
+        Use the recurrent neural network for one time step, in many environments at once
+
+        Each environment keeps its own state between two calls, until reset() is called or the Genome changes.
+
+        :param inputs: array of shape (n_environments, # of inputs)
+
+        :return: array of shape (n_environments, # of outputs)
+        """
+        return self.plan.step(inputs)
+
+    def reset(self):
+        """
+        Forget the state of the recurrent connections, for example at the beginning of an episode
+        """
+        if self._plan is not None:
+            self._plan.reset()
+
+    @property
+    def recurrent(self):
+        """
+        Tell if this Genome has recurrent connections
+
+        :return: True if one of the enabled connections kept by the Plan closes a cycle
+        """
+        return bool(self.plan.recurrent.any())
+
+    @property
+    def plan(self):
+        """
+        Compiled evaluation plan of this Genome, rebuilt only after the Genome has changed
+
+        :return: the Plan of this Genome
+        """
+        if self._plan is None:
+            self._plan = Plan(self)
+        return self._plan
+
+    def invalidate_plan(self):
+        """
+        Drop the compiled plan and the content hash, they will be rebuilt when they are needed
+
+        Used by :
+        Genome.mutate()
+        Population.mutate_weights()
+        """
+        self._plan = None
+        self._hash = None
 
-        # 2nd step : launch the evaluation !
-        while queue:
-            node = queue.get()
-            print(node)
-            node.think()
-            for con in node.outward_connections:
-                target = con.node_out
-                if not target.triggered:
-                    queue.put(target, -1)
+    def update_plan(self, added, removed : Connection = None):
+        """
+        Drop the content hash and update the compiled plan after a structural mutation, see Plan.update()
 
-        return [node.value for node in self.output]
+        Used by :
+        Genome.add_connection()
+        Genome.mutation_add_node()
 
+        :param added: the new Connections
+        :param removed: the Connection disabled by the mutation, if any
+
+        :return: None
+        """
+        if self._plan is not None:
+            self._plan = self._plan.update(self, added, removed) if self._sorted else None
+        self._hash = None
 
 
     # ----------------------------------------------- MUTATE -----------------------------------------------------------
-    def mutate(self, innovation_history):
+    def mutate(self, registry : InnovationRegistry, rng : np.random.Generator = None):
         """
         Mutate.
 
@@ -121,104 +209,573 @@ class Genome:
         - Connection mutation, which adds a new Connection
         - Structural mutation, which adds a new Node
 
+        :param registry: InnovationRegistry giving the innovation numbers of the new Connections
+        :param rng: random generator of this Genome (default : a new one)
+
         :return: None
         """
-        if np.random.rand() < MUTATION_CHANGE_ALL_WEIGHT:
-            for con in self.connections:
-                con.mutate()
+        if rng is None:
+            rng = np.random.default_rng()
+        if rng.random() < self.config.MUTATION_CHANGE_ALL_WEIGHT:
+            for con in self.standard_connections + self.bias_connections:
+                con.mutate(self.config, rng)
+            self.invalidate_plan()
+
+        self.mutate_structure(registry, rng)
+
+    def mutate_structure(self, registry : InnovationRegistry, rng : np.random.Generator = None):
+        """
+        Maybe add a new Connection and maybe add a new Node, without changing the weights
+
+        Used by :
+        Genome.mutate()
 
-        if np.random.rand() < MUTATION_CHANCE_ADD_CONNECTION:
-            self.mutation_add_connection(innovation_history)
+        :param registry: InnovationRegistry giving the innovation numbers of the new Connections
+        :param rng: random generator of this Genome (default : a new one)
+
+        :return: None
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        if rng.random() < self.config.MUTATION_CHANCE_ADD_CONNECTION:
+            self.mutation_add_connection(registry, rng=rng)
 
-        if np.random.rand() < MUTATION_CHANCE_ADD_NODE:
-            self.mutation_add_node(innovation_history)
+        if rng.random() < self.config.MUTATION_CHANCE_ADD_NODE:
+            self.mutation_add_node(registry, rng)
 
 
-    def mutation_add_connection(self, innovation_history, first_node_pool = None):
+    def mutation_add_connection(self, registry : InnovationRegistry, first_node_pool = None,
+                                rng : np.random.Generator = None):
         """
         Make a new connection between two nodes that weren't connected before
 
+        Random pairs of Nodes are tried first, which is fast unless the Genome is almost fully connected.
+        Then every first Node is tried, in a random order.
+
+        :param registry: InnovationRegistry giving the innovation number of the new Connection
+        :param first_node_pool: Nodes where the Connection can start (default : every Node but the bias)
+        :param rng: random generator of this Genome (default : a new one)
+
         :return: that new connection, or None if no connection have been found
         """
+        if rng is None:
+            rng = np.random.default_rng()
         if first_node_pool is None:
-            first_nodes_list = self.input + self.hidden + self.output
+            first_groups = (self.input, self.hidden, self.output)
         else:
-            first_nodes_list = first_node_pool
-        np.random.shuffle(first_nodes_list)
-        # Take the first node amongst the input and hidden nodes
-        for first_node in first_nodes_list:
-            second_node = self.find_connectable_node(first_node)
+            first_groups = (first_node_pool,)
+        second_groups = (self.hidden, self.output)
+        n_first = sum(len(group) for group in first_groups)
+        n_second = len(self.hidden) + len(self.output)
+        if n_first == 0 or n_second == 0:
+            return None
+
+        # Take the first node amongst the input, hidden and output nodes
+        for _ in range(self.config.MUTATION_ADD_CONNECTION_TRIES):
+            first_node = Genome.pick(first_groups, rng.integers(n_first))
+            second_node = Genome.pick(second_groups, rng.integers(n_second))
+            if second_node.name not in first_node.linked:
+                return self.add_connection(first_node, second_node, registry, rng)
+
+        for i in rng.permutation(n_first):
+            first_node = Genome.pick(first_groups, i)
+            second_node = self.find_connectable_node(first_node, rng)
             if second_node is not None:
-                new_connection = Connection(first_node, second_node)
-                self.standard_connections.append(new_connection)
-                # Check what innovation number it should have
-                try:
-                    index = innovation_history.index(new_connection)
-                except ValueError:
-                    # It's a new connection never made before
-                    new_connection.innovation_number = Connection.global_innovation_number
-                    Connection.global_innovation_number += 1
-                    innovation_history.append(new_connection)
-                else:
-                    # It's a connection that has been made before
-                    new_connection.innovation_number = innovation_history[index]
-                return new_connection
+                return self.add_connection(first_node, second_node, registry, rng)
         # If it didn't find any two unconnected nodes
         return None
 
+    def add_connection(self, first_node, second_node, registry : InnovationRegistry, rng : np.random.Generator = None):
+        """
+        Add a Connection first_node -> second_node
 
-    def find_connectable_node(self, first_node):
+        Used by :
+        Genome.mutation_add_connection()
+
+        :param first_node: beginning of the connection
+        :param second_node: end of the connection
+        :param registry: InnovationRegistry giving the innovation number of the new Connection
+        :param rng: random generator of the weight (default : a new one)
+
+        :return: that new Connection
+        """
+        new_connection = Connection(first_node, second_node,
+                                    innovation_number=registry.connection(first_node, second_node),
+                                    config=self.config, rng=rng)
+        self.standard_connections.append(new_connection)
+        if self._sorted:
+            self.insert(new_connection)
+        self.update_plan([new_connection])
+        return new_connection
+
+    def find_connectable_node(self, first_node, rng : np.random.Generator = None):
         """
         Find a node (2) that can be connected to the first_node (1) with a connection (1) -> (2)
 
         :param first_node: beginning of the connection
+        :param rng: random generator of this Genome (default : a new one)
 
         :return: a node (2) that can be connected to first_node (1) with a connection (1) -> (2)
         """
         # Take the second node amongst the hidden and output nodes that are not linked to the first one
-        non_linked = self.hidden + self.output
-        for con in first_node.outward_connections:
-            # con.node_out is forced to be in that list
-            # - It is amongst the hidden and output nodes
-            # - It has not been removed before because two connections can't have the same input AND output
-            non_linked.remove(con.node_out)
-        if non_linked:
-            # If it can find a non-linked node, then it's done !
-            second_node = np.random.choice(non_linked)
-            return second_node
-        else:
+        n_linked = len(first_node.linked)
+        n_second = len(self.hidden) + len(self.output)
+        if n_linked == n_second:
             return None
+        # Pick the k-th non linked node
+        if rng is None:
+            rng = np.random.default_rng()
+        k = rng.integers(n_second - n_linked)
+        for group in (self.hidden, self.output):
+            for node in group:
+                if node.name not in first_node.linked:
+                    if k == 0:
+                        return node
+                    k -= 1
+        return None
+
+    @staticmethod
+    def pick(groups, i):
+        """
+        Take the i-th Node of the concatenation of groups, without making that concatenation
 
+        :param groups: lists of Nodes
+        :param i: index of the Node
 
-    def mutation_add_node(self, innovation_history):
+        :return: the i-th Node
+        """
+        for group in groups:
+            if i < len(group):
+                return group[i]
+            i -= len(group)
+        raise IndexError("Node index out of range")
+
+
+    def mutation_add_node(self, registry : InnovationRegistry, rng : np.random.Generator = None):
         """
         Create a new Node from a Connection
 
         It does those steps :
-        - Take a connection which has a input Node (i) and output Node (o) and a weight of (w)
+        - Take an enabled connection which has a input Node (i) and output Node (o) and a weight of (w)
         - Disable it
         - Make a new Node (n)
         - Make a new Connection (i) -> (n) with a weight of 1
         - Make a new Connection (n) -> (i) with a weight of (w)
 
-        :return: that new Node
+        The new Connections take the place of the old one in gene order, and (n) -> (o) takes its place amongst
+        the inputs of (o) in the Plan (see Plan.update()).
+
+        :param registry: InnovationRegistry giving the name of the new Node and the innovation numbers
+        :param rng: random generator of this Genome (default : a new one)
+
+        :return: that new Node, or None if there is no enabled Connection
         """
-        con : Connection = np.random.choice(self.connections)
+        enabled = [k for k, con in enumerate(self.standard_connections) if con.enabled]
+        if not enabled:
+            return None
+        if rng is None:
+            rng = np.random.default_rng()
+        k = enabled[rng.integers(len(enabled))]
+        con : Connection = self.standard_connections[k]
         con.enabled = False
-        node = Node(Node.HIDDEN, con.innovation_number)
+        con.recurrent = None
+        node = Node(Node.HIDDEN, registry.node(con))
         self.hidden.append(node)
-        self.standard_connections.append(Connection(con.node_in, node, con.weight))
-        self.standard_connections.append(Connection(node, con.node_out, con.weight))
+        new_connections = [Connection(con.node_in, node, con.weight, registry.connection(con.node_in, node)),
+                           Connection(node, con.node_out, con.weight, registry.connection(node, con.node_out))]
+        self.standard_connections[k + 1:k + 1] = new_connections
+        if self._sorted:
+            for new_connection in new_connections:
+                self.insert(new_connection)
+        self.update_plan(new_connections, con)
         return node
 
+    # ---------------------------------------------- TOPOLOGY ----------------------------------------------------------
+    def sort(self):
+        """
+        Compute the level of every Node and find the recurrent Connections, unless they are up to date
+
+        The recurrent flags are part of the Genome : they are copied by clone(), kept by encode() and decode(),
+        and a child of a crossover inherits the ones of its fitter parent. So only the enabled Connections without
+        a flag (every one of them if the Genome has never been sorted) need one :
+        - If no enabled Connection has a flag, a depth first search from the Nodes, in the order inputs, bias,
+          hidden, outputs, following the Connections in gene order, finds them all at once :
+          a Connection is recurrent if it goes back to a Node of the current path.
+        - The levels are computed from the feed forward Connections (see Genome.longest_paths()).
+        - Then the Connections still without a flag are inserted one by one in gene order (see Genome.insert()).
+        After that, the mutations keep the levels and the recurrent flags up to date, without sorting again.
+
+        Used by :
+        Plan()
+        Genome.encode()
+
+        :return: None
+        """
+        if self._sorted:
+            return
+        nodes = self.input + [self.bias] + self.hidden + self.output
+        index = {id(node): i for i, node in enumerate(nodes)}
+        connections = []
+        for con in self.bias_connections + self.standard_connections:
+            if con.enabled:
+                connections.append(con)
+            else:
+                con.recurrent = None
+        con_in = [index[id(con.node_in)] for con in connections]
+        con_out = [index[id(con.node_out)] for con in connections]
+
+        if all(con.recurrent is None for con in connections):
+            for con, loop in zip(connections, Genome.find_cycles(len(nodes), con_in, con_out)):
+                con.recurrent = loop
+        feed_forward = [k for k, con in enumerate(connections) if con.recurrent is False]
+        levels = Genome.longest_paths(len(nodes), [con_in[k] for k in feed_forward],
+                                      [con_out[k] for k in feed_forward])
+        for node, level in zip(nodes, levels):
+            node.level = level
+        for con in connections:
+            if con.recurrent is None:
+                self.insert(con)
+        self._sorted = True
+
+    @staticmethod
+    def find_cycles(n_nodes, con_in, con_out):
+        """
+        Find recurrent Connections with a depth first search, starting from each Node in turn
+
+        :param n_nodes: # of Nodes
+        :param con_in: index of the input Node of each Connection
+        :param con_out: index of the output Node of each Connection
+
+        :return: list telling for each Connection if it is recurrent (it closes a cycle)
+        """
+        outward = [[] for _ in range(n_nodes)]
+        for k, node in enumerate(con_in):
+            outward[node].append(k)
+
+        # 0 : not visited, 1 : in the current path, 2 : done
+        state = [0] * n_nodes
+        recurrent = [False] * len(con_in)
+        for root in range(n_nodes):
+            if state[root]:
+                continue
+            state[root] = 1
+            stack = [(root, iter(outward[root]))]
+            while stack:
+                node, connections = stack[-1]
+                for k in connections:
+                    target = con_out[k]
+                    if state[target] == 0:
+                        state[target] = 1
+                        stack.append((target, iter(outward[target])))
+                        break
+                    elif state[target] == 1:
+                        recurrent[k] = True
+                else:
+                    state[node] = 2
+                    stack.pop()
+        return recurrent
+
+    @staticmethod
+    def longest_paths(n_nodes, con_in, con_out):
+        """
+        Level of every Node : the # of Connections of the longest path ending at that Node
+
+        :param n_nodes: # of Nodes
+        :param con_in: index of the input Node of each feed forward Connection
+        :param con_out: index of the output Node of each feed forward Connection
+
+        :return: list of the levels
+        """
+        outward = [[] for _ in range(n_nodes)]
+        missing = [0] * n_nodes
+        for i, o in zip(con_in, con_out):
+            outward[i].append(o)
+            missing[o] += 1
+
+        # Visit the Nodes in topological order : a Node is ready once all its inputs are visited
+        level = [0] * n_nodes
+        ready = [node for node in range(n_nodes) if missing[node] == 0]
+        for node in ready:
+            for target in outward[node]:
+                if level[target] <= level[node]:
+                    level[target] = level[node] + 1
+                missing[target] -= 1
+                if missing[target] == 0:
+                    ready.append(target)
+        if len(ready) < n_nodes:
+            raise ValueError("The feed forward Connections make a cycle")
+        return level
+
+    def insert(self, con : Connection):
+        """
+        Insert an enabled Connection in the topology
+
+        It is recurrent if its output Node already reaches its input Node. Otherwise, the Nodes after it whose
+        level is too low are raised : only the Nodes downstream of the new Connection are visited.
+
+        Used by :
+        Genome.sort()
+        Genome.add_connection()
+        Genome.mutation_add_node()
+
+        :param con: the Connection, its recurrent flag must be None
+
+        :return: True if the Connection is recurrent
+        """
+        con.recurrent = Genome.reaches(con.node_out, con.node_in)
+        if not con.recurrent and con.node_out.level <= con.node_in.level:
+            con.node_out.level = con.node_in.level + 1
+            stack = [con.node_out]
+            while stack:
+                node = stack.pop()
+                level = node.level
+                for out in node.outward_connections:
+                    if out.recurrent is False and out.node_out.level <= level:
+                        out.node_out.level = level + 1
+                        stack.append(out.node_out)
+        return con.recurrent
+
+    @staticmethod
+    def reaches(start, target):
+        """
+        Tell if there is a path of inserted feed forward Connections from start to target
+
+        The level grows along such a path, so only the Nodes of lower level than target are visited.
+        The Connections that are disabled or not inserted yet have a recurrent flag of None, they are skipped.
+
+        :param start: first Node of the path
+        :param target: last Node of the path
+
+        :return: True if there is such a path (or if start is target)
+        """
+        if start is target:
+            return True
+        if start.level >= target.level:
+            return False
+        level = target.level
+        seen = {id(start)}
+        stack = [start]
+        while stack:
+            for out in stack.pop().outward_connections:
+                if out.recurrent is False:
+                    node = out.node_out
+                    if node.level < level:
+                        if id(node) not in seen:
+                            seen.add(id(node))
+                            stack.append(node)
+                    elif node is target:
+                        return True
+        return False
+
+    # ---------------------------------------------- CROSSOVER ---------------------------------------------------------
+    def crossover(self, other, fitter, rng : np.random.Generator = None):
+        """
+        Make a child of this Genome and other
+
+        As described in http://nn.cs.utexas.edu/downloads/papers/stanley.ec02.pdf (3.2) :
+        - The genes are lined up by innovation number
+        - Matching genes are inherited randomly from either parent
+        - Disjoint and excess genes are inherited from the fitter parent
+        - A gene disabled in either parent is disabled in the child with a chance of config.CROSSOVER_DISABLED
+        - The child keeps the recurrent flags of the fitter parent, see Genome.sort()
+
+        :param other: the other parent
+        :param fitter: the fitter parent, self or other
+        :param rng: random generator of the child (default : a new one)
+
+        :return: the child
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        weaker = other if fitter is self else self
+        connections = fitter.bias_connections + fitter.standard_connections
+        weaker_connections = weaker.bias_connections + weaker.standard_connections
+
+        # Line up the genes
+        innovations = np.fromiter((con.innovation_number for con in connections), dtype=np.int64,
+                                  count=len(connections))
+        weaker_innovations = np.fromiter((con.innovation_number for con in weaker_connections), dtype=np.int64,
+                                         count=len(weaker_connections))
+        _, matching, weaker_matching = np.intersect1d(innovations, weaker_innovations,
+                                                      assume_unique=True, return_indices=True)
+
+        weights = np.fromiter((con.weight for con in connections), dtype=np.float64, count=len(connections))
+        disabled = np.fromiter((not con.enabled for con in connections), dtype=bool, count=len(connections))
+        weaker_weights = np.fromiter((con.weight for con in weaker_connections), dtype=np.float64,
+                                     count=len(weaker_connections))
+        weaker_disabled = np.fromiter((not con.enabled for con in weaker_connections), dtype=bool,
+                                      count=len(weaker_connections))
+
+        from_weaker = rng.random(len(matching)) < 0.5
+        weights[matching[from_weaker]] = weaker_weights[weaker_matching[from_weaker]]
+        disabled[matching] |= weaker_disabled[weaker_matching]
+        enabled = ~(disabled & (rng.random(len(connections)) < self.config.CROSSOVER_DISABLED))
+
+        # Build the child with the Nodes of the fitter parent
+        child = self.__class__.__new__(self.__class__)
+        child._plan = None
+        child._hash = None
+        child._sorted = False
+        child.config = self.config
+        child.input = [node.clone() for node in fitter.input]
+        child.bias = fitter.bias.clone()
+        child.hidden = [node.clone() for node in fitter.hidden]
+        child.output = [node.clone() for node in fitter.output]
+        child.standard_connections = []
+        child.bias_connections = []
+
+        old_nodes = fitter.input + [fitter.bias] + fitter.hidden + fitter.output
+        nodes = child.input + [child.bias] + child.hidden + child.output
+        child_of = {id(old_node): node for old_node, node in zip(old_nodes, nodes)}
+        for con, weight, on in zip(connections, weights.tolist(), enabled.tolist()):
+            new_connection = Connection(child_of[id(con.node_in)], child_of[id(con.node_out)],
+                                        weight, con.innovation_number)
+            new_connection.enabled = on
+            new_connection.recurrent = con.recurrent if on else None
+            if con.node_in is fitter.bias:
+                child.bias_connections.append(new_connection)
+            else:
+                child.standard_connections.append(new_connection)
+        return child
+
     # ------------------------------------------------ TOOL ------------------------------------------------------------
+    def renumber(self, names, innovations):
+        """
+        Rename the Nodes and change the innovation numbers of the Connections, see InnovationRegistry.renumber()
+
+        Used by :
+        Population.mutate()
+
+        :param names: dict old name -> new name of the renamed Nodes
+        :param innovations: dict old innovation number -> new innovation number of the renumbered Connections
+
+        :return: None
+        """
+        for node in self.input + [self.bias] + self.hidden + self.output:
+            node.name = names.get(node.name, node.name)
+            if not names.keys().isdisjoint(node.linked):
+                node.linked = {names.get(name, name) for name in node.linked}
+        for con in self.bias_connections + self.standard_connections:
+            con.innovation_number = innovations.get(con.innovation_number, con.innovation_number)
+        self._hash = None
+
     def clone(self):
         """
         Make a deepcopy of this Genome
 
         :return: a deepcopy of this Genome
         """
-        return self.__class__(__other=self)
+        # __other is name mangled, so it can't be given as a keyword argument
+        return self.__class__(None, None, None, None, None, None, self)
+
+    def export(self):
+        """
+        Make a frozen copy of the compiled neural network, that only needs NumPy to run
+
+        It can be saved with Network.save() and loaded with Network.load().
+
+        :return: a Network
+        """
+        plan = self.plan
+        return Network(len(plan.values), np.arange(plan.n_inputs), plan.bias, plan.outputs,
+                       [layer.copy() for layer in plan.layers])
+
+    def content_hash(self):
+        """
+        Hash of the (innovation number, input name, output name, weight, enabled, recurrent) of every Connection
+
+        Two Genome with the same hash have the same Connections, so they compute the same thing.
+        It is cached until the Genome changes, see CompactGenome.content_hash().
+
+        :return: a 16 bytes digest
+        """
+        if self._hash is None:
+            self._hash = self.encode().content_hash()
+        return self._hash
+
+    def genes(self):
+        """
+        Innovation numbers and weights of every Connection, sorted by innovation number
+
+        Used by :
+        Population.speciate()
+
+        :return: (innovation numbers, weights)
+        """
+        connections = self.bias_connections + self.standard_connections
+        innovations = np.fromiter((con.innovation_number for con in connections), dtype=np.int64,
+                                  count=len(connections))
+        weights = np.fromiter((con.weight for con in connections), dtype=np.float64, count=len(connections))
+        order = np.argsort(innovations, kind='stable')
+        return innovations[order], weights[order]
+
+    def encode(self):
+        """
+        Make a compact, picklable copy of this Genome made of NumPy arrays
+
+        The Genome is sorted first, so that the recurrent flags of all its enabled Connections are known :
+        the hash of the CompactGenome is the one of the Genome, saved or not (see Genome.content_hash()).
+
+        Used by :
+        Population.evaluate_parallel()
+        GenomeTable.from_genomes()
+        Genome.content_hash()
+
+        :return: a CompactGenome
+        """
+        self.sort()
+        nodes = self.input + [self.bias] + self.hidden + self.output
+        index = {id(node): i for i, node in enumerate(nodes)}
+        connections = self.bias_connections + self.standard_connections
+        return CompactGenome(len(self.input),
+                             len(self.output),
+                             [-1 if node.name is None else node.name for node in self.hidden],
+                             [index[id(con.node_in)] for con in connections],
+                             [index[id(con.node_out)] for con in connections],
+                             [con.weight for con in connections],
+                             [con.enabled for con in connections],
+                             [-1 if con.innovation_number is None else con.innovation_number for con in connections],
+                             [-1 if con.recurrent is None or not con.enabled else con.recurrent
+                              for con in connections])
+
+    @classmethod
+    def decode(cls, compact : CompactGenome, config : Config = None):
+        """
+        Rebuild a Genome from a CompactGenome
+
+        The Genome keeps the recurrent flags of the CompactGenome, its levels are computed when it is sorted.
+
+        :param compact: the result of Genome.encode()
+        :param config: parameters of the Genome (default : Config.default())
+
+        :return: a new Genome
+        """
+        inputs = compact.inputs
+        genome = cls.__new__(cls)
+        genome._plan = None
+        genome._hash = None
+        genome._sorted = False
+        genome.config = config or Config.default()
+        genome.input = [Node(Node.SENSOR, i) for i in range(inputs)]
+        genome.bias = Node(Node.SENSOR, inputs)
+        genome.hidden = [Node(Node.HIDDEN, None if name == -1 else name) for name in compact.hidden.tolist()]
+        genome.output = [Node(Node.OUTPUT, inputs + 1 + i) for i in range(compact.outputs)]
+        genome.standard_connections = []
+        genome.bias_connections = []
+
+        nodes = genome.input + [genome.bias] + genome.hidden + genome.output
+        for i, o, weight, enabled, innovation, loop in zip(compact.con_in.tolist(), compact.con_out.tolist(),
+                                                           compact.weights.tolist(), compact.enabled.tolist(),
+                                                           compact.innovations.tolist(), compact.recurrent.tolist()):
+            con = Connection(nodes[i], nodes[o], weight, None if innovation == -1 else innovation)
+            con.enabled = enabled
+            if enabled and loop != -1:
+                con.recurrent = loop == 1
+            if i == inputs:
+                genome.bias_connections.append(con)
+            else:
+                genome.standard_connections.append(con)
+        return genome
 
 
     # ------------------------------------------------ DRAW ------------------------------------------------------------
@@ -229,6 +786,7 @@ class Genome:
         :return: None
         """
         import graphviz as gv
+        from Params import node_color, node_rank
         graph = gv.Digraph("Genome", format='svg')
         # Make the graph go from left to right
         graph.attr(rankdir='LR')
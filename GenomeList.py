@@ -0,0 +1,63 @@
+"""
+List of genomes decoded on demand
+
+Created by Shinrod at 18/10/2026
+"""
+from Config import Config
+from Genome import Genome
+from GenomeTable import GenomeTable
+
+
+class GenomeList:
+    """
+    List of Genome stored in a GenomeTable, each Genome is decoded the first time it is accessed.
+
+    Used by :
+    Population.load()
+    """
+
+    def __init__(self, table : GenomeTable, config : Config = None):
+        """
+        Make a new GenomeList
+
+        :param table: the GenomeTable holding the Genome, it can be memory-mapped
+        :param config: Config of the decoded Genome (default : Config.default())
+        """
+        self.table = table
+        self.config = config
+        self.genomes = [None] * len(table)
+
+    def compacts(self):
+        """
+        CompactGenome of every Genome, without decoding the Genome that haven't been accessed
+
+        :return: list of CompactGenome
+        """
+        return [self.table[i] if genome is None else genome.encode() for i, genome in enumerate(self.genomes)]
+
+    def content_hashes(self):
+        """
+        Genome.content_hash() of every Genome, without decoding the Genome that haven't been accessed
+
+        :return: list of digests
+        """
+        return [self.table[i].content_hash() if genome is None else genome.content_hash()
+                for i, genome in enumerate(self.genomes)]
+
+    def __len__(self):
+        return len(self.genomes)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        genome = self.genomes[i]
+        if genome is None:
+            genome = self.genomes[i] = Genome.decode(self.table[i], self.config)
+        return genome
+
+    def __setitem__(self, i, genome):
+        self.genomes[i] = genome
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
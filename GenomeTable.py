@@ -0,0 +1,178 @@
+"""
+Columnar storage of many genomes
+
+Created by Shinrod at 18/10/2026
+"""
+from CompactGenome import CompactGenome
+import numpy as np
+import os
+
+
+class GenomeTable:
+    """
+    Many CompactGenome concatenated in a single set of arrays.
+
+    The hidden Nodes of the i-th Genome are self.hidden[self.node_offsets[i]:self.node_offsets[i + 1]],
+    its Connections are the same slice, with self.con_offsets, of the Connection arrays.
+    Every Genome has the same # of inputs and outputs.
+    """
+
+    __slots__ = ('inputs', 'outputs', 'hidden', 'node_offsets',
+                 'con_in', 'con_out', 'weights', 'enabled', 'innovations', 'recurrent', 'con_offsets')
+
+    # Names of the arrays, as saved by GenomeTable.save()
+    ARRAYS = ('hidden', 'node_offsets', 'con_in', 'con_out', 'weights', 'enabled', 'innovations', 'recurrent',
+              'con_offsets')
+
+    def __init__(self, inputs : int, outputs : int, hidden, node_offsets,
+                 con_in, con_out, weights, enabled, innovations, recurrent, con_offsets):
+        """
+        Make a new GenomeTable
+
+        Use GenomeTable.from_genomes() to build it from Genome objects.
+
+        :param inputs: # of inputs of every Genome
+        :param outputs: # of outputs of every Genome
+        :param hidden: names of the hidden Nodes of every Genome
+        :param node_offsets: where the hidden Nodes of each Genome begin, plus the total # of hidden Nodes
+        :param con_in: index of the input Node of each Connection
+        :param con_out: index of the output Node of each Connection
+        :param weights: weight of each Connection
+        :param enabled: True if the Connection is enabled
+        :param innovations: innovation number of each Connection
+        :param recurrent: 1 (recurrent), 0 (feed forward) or -1 (unknown) for each Connection, see CompactGenome
+        :param con_offsets: where the Connections of each Genome begin, plus the total # of Connections
+        """
+        self.inputs = inputs
+        self.outputs = outputs
+        self.hidden = hidden
+        self.node_offsets = node_offsets
+        self.con_in = con_in
+        self.con_out = con_out
+        self.weights = weights
+        self.enabled = enabled
+        self.innovations = innovations
+        self.recurrent = recurrent
+        self.con_offsets = con_offsets
+
+    @classmethod
+    def from_genomes(cls, genomes):
+        """
+        Pack Genomes in a GenomeTable
+
+        :param genomes: list of Genome or CompactGenome
+
+        :return: a new GenomeTable
+        """
+        compacts = [genome if isinstance(genome, CompactGenome) else genome.encode() for genome in genomes]
+
+        def concatenate(name, dtype):
+            return np.concatenate([getattr(compact, name) for compact in compacts] + [np.empty(0, dtype)])
+
+        def offsets(name):
+            result = np.zeros(len(compacts) + 1, dtype=np.int64)
+            result[1:] = np.cumsum([len(getattr(compact, name)) for compact in compacts])
+            return result
+
+        return cls(compacts[0].inputs if compacts else 0,
+                   compacts[0].outputs if compacts else 0,
+                   concatenate('hidden', np.int64),
+                   offsets('hidden'),
+                   concatenate('con_in', np.int32),
+                   concatenate('con_out', np.int32),
+                   concatenate('weights', np.float64),
+                   concatenate('enabled', bool),
+                   concatenate('innovations', np.int64),
+                   concatenate('recurrent', np.int8),
+                   offsets('con_in'))
+
+    def save(self, path):
+        """
+        Save the arrays in the directory path, one .npy file per array
+
+        :param path: directory, it is created if needed
+
+        :return: None
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in GenomeTable.ARRAYS:
+            np.save(os.path.join(path, name + '.npy'), getattr(self, name))
+
+    @classmethod
+    def load(cls, path, inputs : int, outputs : int, mmap : bool = True):
+        """
+        Load the arrays saved by GenomeTable.save()
+
+        :param path: directory given to GenomeTable.save()
+        :param inputs: # of inputs of every Genome
+        :param outputs: # of outputs of every Genome
+        :param mmap: if True, the arrays are memory-mapped (read only) instead of being read
+
+        :return: a new GenomeTable
+        """
+        arrays = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode='r' if mmap else None)
+                  for name in GenomeTable.ARRAYS if os.path.exists(os.path.join(path, name + '.npy'))}
+        # Saved without the recurrent flags : they are found again when the Genome are sorted
+        arrays.setdefault('recurrent', np.full(len(arrays['con_in']), -1, dtype=np.int8))
+        return cls(inputs, outputs, **arrays)
+
+    @property
+    def nbytes(self):
+        """
+        # of bytes used by the arrays
+        """
+        return sum(array.nbytes for array in (self.hidden, self.node_offsets, self.con_in, self.con_out,
+                                              self.weights, self.enabled, self.innovations, self.recurrent,
+                                              self.con_offsets))
+
+    def __len__(self):
+        return len(self.con_offsets) - 1
+
+    def __getitem__(self, i):
+        """
+        Get the i-th Genome, its arrays are views of the table arrays
+
+        :param i: index of the Genome
+
+        :return: a CompactGenome
+        """
+        if not -len(self) <= i < len(self):
+            raise IndexError("GenomeTable index out of range")
+        i %= len(self)
+        nodes = slice(self.node_offsets[i], self.node_offsets[i + 1])
+        connections = slice(self.con_offsets[i], self.con_offsets[i + 1])
+        return CompactGenome(self.inputs, self.outputs, self.hidden[nodes],
+                             self.con_in[connections], self.con_out[connections], self.weights[connections],
+                             self.enabled[connections], self.innovations[connections], self.recurrent[connections])
+
+    def take(self, indices):
+        """
+        Copy some of the Genome in a new GenomeTable
+
+        :param indices: indices of the Genome to copy, a Genome can be copied several times
+
+        :return: a new GenomeTable
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        nodes, node_offsets = GenomeTable.rows(self.node_offsets, indices)
+        connections, con_offsets = GenomeTable.rows(self.con_offsets, indices)
+        return self.__class__(self.inputs, self.outputs, self.hidden[nodes], node_offsets,
+                              self.con_in[connections], self.con_out[connections], self.weights[connections],
+                              self.enabled[connections], self.innovations[connections], self.recurrent[connections],
+                              con_offsets)
+
+    @staticmethod
+    def rows(offsets, indices):
+        """
+        Rows of the Genome given by indices
+
+        :param offsets: self.node_offsets or self.con_offsets
+        :param indices: indices of the Genome
+
+        :return: (indices of the rows, offsets of the Genome in those rows)
+        """
+        counts = offsets[indices + 1] - offsets[indices]
+        new_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(counts, out=new_offsets[1:])
+        rows = np.arange(new_offsets[-1]) + np.repeat(offsets[indices] - new_offsets[:-1], counts)
+        return rows, new_offsets
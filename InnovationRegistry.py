@@ -0,0 +1,128 @@
+"""
+Global record of the structural innovations
+
+Created by Shinrod at 18/10/2026
+"""
+
+
+class InnovationRegistry:
+    """
+    Give the same innovation number to the same structural mutation.
+
+    As described in http://nn.cs.utexas.edu/downloads/papers/stanley.ec02.pdf (3.2)
+
+    A new Connection is identified by the names of its two Nodes : (node_in.name, node_out.name).
+    A new Node is identified by the innovation number of the Connection it splits.
+    The innovation numbers and Node names keep growing, but the record of the innovations
+    is meant to be reset at each generation with reset().
+    """
+
+    def __init__(self, next_node_name : int = 0, next_innovation : int = 0):
+        """
+        Make a new InnovationRegistry
+
+        :param next_node_name: name of the next new Node (it must be higher than the name of every existing Node)
+        :param next_innovation: innovation number of the next new Connection
+        """
+        self.next_node_name = next_node_name
+        self.next_innovation = next_innovation
+        self.connections = {}
+        self.nodes = {}
+
+    def connection(self, node_in, node_out):
+        """
+        Get the innovation number of a Connection node_in -> node_out
+
+        :param node_in: input Node
+        :param node_out: output Node
+
+        :return: the innovation number given to that Connection, or a new one
+        """
+        key = (node_in.name, node_out.name)
+        innovation = self.connections.get(key)
+        if innovation is None:
+            innovation = self.next_innovation
+            self.next_innovation += 1
+            self.connections[key] = innovation
+        return innovation
+
+    def node(self, connection):
+        """
+        Get the name of the Node splitting a Connection
+
+        :param connection: the split Connection
+
+        :return: the name given to that Node, or a new one
+        """
+        name = self.nodes.get(connection.innovation_number)
+        if name is None:
+            name = self.next_node_name
+            self.next_node_name += 1
+            self.nodes[connection.innovation_number] = name
+        return name
+
+    def renumber(self, first_node_name : int, first_innovation : int):
+        """
+        Give new numbers to the innovations recorded since the counters were at first_node_name and first_innovation,
+        in an order that only depends on which innovations were recorded, not on the order they were recorded in
+
+        The new Connections are numbered by (name of node_in, name of node_out), the new Nodes by the innovation number
+        of the Connection they split. A new Connection to a new Node is numbered once that Node has its new name.
+
+        Used by :
+        Population.mutate()
+
+        :param first_node_name: self.next_node_name before the first of these innovations
+        :param first_innovation: self.next_innovation before the first of these innovations
+
+        :return: (dict old name -> new name, dict old innovation number -> new innovation number)
+        """
+        names = {}
+        innovations = {}
+        connections = {key: innovation for key, innovation in self.connections.items()
+                       if innovation >= first_innovation}
+        nodes = {split: name for split, name in self.nodes.items() if name >= first_node_name}
+        next_node_name, next_innovation = first_node_name, first_innovation
+
+        while connections or nodes:
+            left = len(connections) + len(nodes)
+            ready = sorted((names.get(node_in, node_in), names.get(node_out, node_out), innovation)
+                           for (node_in, node_out), innovation in connections.items()
+                           if (node_in < first_node_name or node_in in names)
+                           and (node_out < first_node_name or node_out in names))
+            for node_in, node_out, innovation in ready:
+                innovations[innovation] = next_innovation
+                next_innovation += 1
+            connections = {key: innovation for key, innovation in connections.items() if innovation not in innovations}
+
+            ready = sorted((innovations.get(split, split), name) for split, name in nodes.items()
+                           if split < first_innovation or split in innovations)
+            for split, name in ready:
+                names[name] = next_node_name
+                next_node_name += 1
+            nodes = {split: name for split, name in nodes.items() if name not in names}
+            if len(connections) + len(nodes) == left:
+                raise ValueError("Innovations made from innovations that are not recorded")
+
+        self.connections = {(names.get(node_in, node_in), names.get(node_out, node_out)): innovations.get(i, i)
+                            for (node_in, node_out), i in self.connections.items()}
+        self.nodes = {innovations.get(split, split): names.get(name, name) for split, name in self.nodes.items()}
+        return names, innovations
+
+    def reset(self):
+        """
+        Forget the innovations, but keep the counters
+        """
+        self.connections.clear()
+        self.nodes.clear()
+
+    def clone(self):
+        """
+        Make a copy of that InnovationRegistry
+
+        :return: a copy of that InnovationRegistry
+        """
+        clone = self.__class__(self.next_node_name, self.next_innovation)
+        clone.connections.update(self.connections)
+        clone.nodes.update(self.nodes)
+        return clone
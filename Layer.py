@@ -0,0 +1,111 @@
+"""
+One level of a compiled neural network
+
+This module only needs NumPy.
+
+Created by Shinrod at 18/10/2026
+"""
+import numpy as np
+
+
+class Layer:
+    """
+    Nodes of the same level, computed at once : values[targets] = activation(weighted sums of values[sources])
+
+    The weights are stored in one of two ways :
+    - dense : self.matrix of shape (# sources, # targets), the weighted sums are values[sources] @ self.matrix
+    - sparse (CSR) : the inputs of the k-th target are self.indices[self.indptr[k]:self.indptr[k + 1]]
+      weighted by the same slice of self.weights, the weighted sums are segment sums (np.add.reduceat)
+    """
+
+    # A layer is dense if (# Connections) >= DENSITY * (# sources) * (# targets), same default as Params.SPARSE_DENSITY
+    DENSITY = 0.01
+
+    __slots__ = ('targets', 'sources', 'matrix', 'indices', 'weights', 'indptr', 'nonempty')
+
+    # Arrays given to __init__, the ones set to None depend on the storage
+    ARRAYS = ('targets', 'sources', 'matrix', 'indices', 'weights', 'indptr')
+
+    def __init__(self, targets, sources=None, matrix=None, indices=None, weights=None, indptr=None):
+        """
+        Make a new Layer, either dense (sources and matrix) or sparse (indices, weights and indptr)
+
+        Use Layer.build() to choose the best storage automatically.
+
+        :param targets: index of the Nodes computed by this layer
+        :param sources: (dense) index of the Nodes read by this layer
+        :param matrix: (dense) weight matrix of shape (# sources, # targets)
+        :param indices: (sparse) index of the input Node of each Connection, grouped by target
+        :param weights: (sparse) weight of each Connection
+        :param indptr: (sparse) where the Connections of each target begin, plus the # of Connections
+        """
+        self.targets = np.asarray(targets, dtype=np.int64)
+        self.sources = None if sources is None else np.asarray(sources, dtype=np.int64)
+        self.matrix = None if matrix is None else np.asarray(matrix, dtype=np.float64)
+        self.indices = None if indices is None else np.asarray(indices, dtype=np.int64)
+        self.weights = None if weights is None else np.asarray(weights, dtype=np.float64)
+        self.indptr = None if indptr is None else np.asarray(indptr, dtype=np.int64)
+        # Targets with at least one input, np.add.reduceat doesn't handle empty segments
+        self.nonempty = None if indptr is None else np.flatnonzero(np.diff(self.indptr))
+
+    @classmethod
+    def build(cls, targets, sources, columns, weights, density : float = DENSITY):
+        """
+        Make a Layer from its Connections, dense or sparse according to the density of the Connections
+
+        :param targets: index of the Nodes computed by this layer
+        :param sources: index of the input Node of each Connection
+        :param columns: position in targets of the output Node of each Connection
+        :param weights: weight of each Connection
+        :param density: the Layer is dense if (# Connections) >= density * (# sources) * (# targets)
+
+        :return: a new Layer
+        """
+        order = np.argsort(columns, kind='stable')
+        sources, columns, weights = sources[order], columns[order], weights[order]
+        unique, rows = np.unique(sources, return_inverse=True)
+
+        if len(sources) >= density * len(unique) * len(targets):
+            matrix = np.zeros((len(unique), len(targets)))
+            np.add.at(matrix, (rows, columns), weights)
+            return cls(targets, sources=unique, matrix=matrix)
+
+        indptr = np.zeros(len(targets) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=len(targets)), out=indptr[1:])
+        return cls(targets, indices=sources, weights=weights, indptr=indptr)
+
+    @property
+    def sparse(self):
+        """
+        Tell if the weights are stored as CSR arrays
+        """
+        return self.matrix is None
+
+    def evaluate(self, values):
+        """
+        Weighted sums of the inputs of each target
+
+        :param values: values of the Nodes, array of shape (# Nodes,) or (n_samples, # Nodes)
+
+        :return: array of shape (# targets,) or (n_samples, # targets)
+        """
+        if self.matrix is not None:
+            return values[..., self.sources] @ self.matrix
+
+        sums = np.zeros(values.shape[:-1] + (len(self.targets),))
+        if len(self.nonempty):
+            products = values[..., self.indices] * self.weights
+            sums[..., self.nonempty] = np.add.reduceat(products, self.indptr[self.nonempty], axis=-1)
+        return sums
+
+    def copy(self):
+        """
+        Copy the Layer and its arrays
+
+        :return: a new Layer
+        """
+        copy = Layer.__new__(Layer)
+        for name in Layer.__slots__:
+            value = getattr(self, name)
+            setattr(copy, name, None if value is None else value.copy())
+        return copy
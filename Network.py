@@ -0,0 +1,165 @@
+"""
+Frozen neural network exported from a Genome
+
+This module only needs NumPy and Layer : they can be shipped and imported without the rest of NEAT.
+
+Created by Shinrod at 18/10/2026
+"""
+from math import exp
+from Layer import Layer
+import numpy as np
+
+
+class Network:
+    """
+    Inference-only copy of a compiled Genome, made by Genome.export().
+
+    The values of the Nodes are stored in a vector : the inputs are written at self.inputs, the bias at self.bias,
+    then each Layer computes values[targets] = activation(weighted sums of values[sources]),
+    with a dense matrix or with CSR arrays, and the outputs are read at self.outputs.
+    'think' doesn't use the Layers but self.program, the same Connections as Python lists (see Plan.think()) :
+    on one sample, a NumPy call per Layer costs more than the whole network.
+    """
+
+    # Activation functions, by name
+    ACTIVATIONS = {'sigmoid': lambda x: 1 / (1 + np.exp(-4.9 * x))}
+    # Same functions on one float, used by 'think', exp(709) is close to the largest float
+    SCALAR_ACTIVATIONS = {'sigmoid': lambda x: 1 / (1 + exp(min(-4.9 * x, 709.0)))}
+
+    def __init__(self, n_nodes : int, inputs, bias : int, outputs, layers, activation : str = 'sigmoid'):
+        """
+        Make a new Network
+
+        :param n_nodes: # of Nodes
+        :param inputs: index of the input Nodes
+        :param bias: index of the bias Node
+        :param outputs: index of the output Nodes
+        :param layers: list of Layer
+        :param activation: name of the activation function, in Network.ACTIVATIONS
+        """
+        self.n_nodes = n_nodes
+        self.inputs = np.asarray(inputs, dtype=np.int64)
+        self.bias = bias
+        self.outputs = np.asarray(outputs, dtype=np.int64)
+        self.layers = list(layers)
+        if activation not in Network.ACTIVATIONS:
+            raise ValueError("Unknown activation function : " + activation)
+        self.activation = activation
+
+        # Value of every Node, kept between two calls for the recurrent Connections
+        self.values = np.zeros(n_nodes)
+        self.values[bias] = 1
+        self.program = self.build_program()
+
+    @property
+    def function(self):
+        """
+        Activation function, looked up by name so that the Network can be pickled
+
+        :return: the function of Network.ACTIVATIONS
+        """
+        return Network.ACTIVATIONS[self.activation]
+
+    # ----------------------------------------------- THINK ------------------------------------------------------------
+    def think(self, inputs):
+        """
+        Evaluate the network on one sample
+
+        :param inputs: inputs given to the network
+
+        :return: array of the outputs
+        """
+        values = self.values
+        values[self.inputs] = inputs
+
+        # Current values, then the values at the beginning of the call in reverse order (see Network.build_program())
+        current = values.tolist()
+        current += current[::-1]
+        function = Network.SCALAR_ACTIVATIONS[self.activation]
+        for node, sources, weights in self.program:
+            total = 0.0
+            for source, weight in zip(sources, weights):
+                total += weight * current[source]
+            current[node] = function(total)
+
+        values[:] = current[:self.n_nodes]
+        return values[self.outputs]
+
+    def think_batch(self, inputs):
+        """
+        Evaluate the network on many samples at once
+
+        :param inputs: array of shape (n_samples, # of inputs)
+
+        :return: array of shape (n_samples, # of outputs)
+        """
+        inputs = np.asarray(inputs, dtype=np.float64)
+        values = np.empty((len(inputs), self.n_nodes))
+        values[:] = self.values
+        values[:, self.inputs] = inputs
+        function = self.function
+        for layer in self.layers:
+            values[:, layer.targets] = function(layer.evaluate(values))
+        return values[:, self.outputs]
+
+    def build_program(self):
+        """
+        Make self.program evaluated by 'think' : (Node, its sources, their weights) for every target of every Layer
+
+        A Layer reads all its sources before writing its targets : a source that is a target of the same Layer
+        is read with the value it had at the beginning of the call. 'think' keeps those values after the current ones,
+        in reverse order : such a source s is given as ~s (= -1 - s), like in Plan.build_program().
+        The zero weights of the dense Layers are left out.
+
+        :return: list of (index of the Node, list of the indices of its sources, list of their weights)
+        """
+        program = []
+        for layer in self.layers:
+            if layer.sparse:
+                sources, weights, indptr = layer.indices, layer.weights, layer.indptr
+            else:
+                # Non zero weights, grouped by target
+                columns, rows = np.nonzero(layer.matrix.T)
+                sources, weights = layer.sources[rows], layer.matrix[rows, columns]
+                indptr = np.zeros(len(layer.targets) + 1, dtype=np.int64)
+                np.cumsum(np.bincount(columns, minlength=len(layer.targets)), out=indptr[1:])
+            sources = np.where(np.isin(sources, layer.targets), ~sources, sources).tolist()
+            weights = weights.tolist()
+            indptr = indptr.tolist()
+            program += [(target, sources[indptr[k]:indptr[k + 1]], weights[indptr[k]:indptr[k + 1]])
+                        for k, target in enumerate(layer.targets.tolist())]
+        return program
+
+    # ------------------------------------------------ FILE ------------------------------------------------------------
+    def save(self, path):
+        """
+        Save the network in a single .npz file
+
+        :param path: path of the file
+
+        :return: None
+        """
+        arrays = {'n_nodes': np.array(self.n_nodes), 'inputs': self.inputs, 'bias': np.array(self.bias),
+                  'outputs': self.outputs, 'activation': np.array(self.activation)}
+        for k, layer in enumerate(self.layers):
+            # Dense Layers save sources and matrix, sparse Layers save indices, weights and indptr
+            for name in Layer.ARRAYS:
+                if getattr(layer, name) is not None:
+                    arrays['%s_%d' % (name, k)] = getattr(layer, name)
+        np.savez(path, n_layers=np.array(len(self.layers)), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a network saved by Network.save()
+
+        :param path: path of the file
+
+        :return: the Network
+        """
+        with np.load(path, allow_pickle=False) as arrays:
+            layers = [Layer(**{name: arrays['%s_%d' % (name, k)] for name in Layer.ARRAYS
+                                if '%s_%d' % (name, k) in arrays})
+                      for k in range(int(arrays['n_layers']))]
+            return cls(int(arrays['n_nodes']), arrays['inputs'], int(arrays['bias']), arrays['outputs'],
+                       layers, str(arrays['activation']))
@@ -1,7 +1,7 @@
 """
 Created by Shinrod at 08/05/2020
 """
-from Params import *
+from Params import SENSOR, HIDDEN, OUTPUT
 from numpy import e
 
 class Node:
@@ -13,6 +13,9 @@ class Node:
     HIDDEN = HIDDEN
     OUTPUT = OUTPUT
 
+    # No __dict__ : a Node is created for every gene of every Genome
+    __slots__ = ('kind', 'name', 'inward_connections', 'outward_connections', 'linked', 'level', 'value', 'triggered')
+
     def __init__(self, kind : int, name : int):
         """
         Make a new Node.
@@ -24,6 +27,10 @@ class Node:
 
         self.inward_connections = []
         self.outward_connections = []
+        # Names of the Nodes at the end of self.outward_connections
+        self.linked = set()
+        # Every feed forward Connection goes to a Node of higher level, see Genome.sort()
+        self.level = 0
 
         self.value = 0
         self.triggered = False
@@ -49,7 +56,7 @@ class Node:
         """
         Make a copy of that Node
 
-        The 'outward_connections' attribute isn't copied by this.
+        The 'outward_connections' and 'linked' attributes aren't copied by this (the level is).
         It has to be rebuilt when making the copies of the connections.
 
         Used by :
@@ -57,7 +64,9 @@ class Node:
 
         :return: a copy of that node
         """
-        return self.__class__(self.kind, self.name)
+        clone = self.__class__(self.kind, self.name)
+        clone.level = self.level
+        return clone
 
 
     def __eq__(self, other):
@@ -68,7 +77,6 @@ class Node:
         self == other
 
         Used by :
-        Genome.clone()
         Connection.__eq__()
 
         :param other: other Node
@@ -37,6 +37,12 @@ And you get the std_var
 SLIGHT_WEIGHT_MUTATION_STD_VAR = (WEIGHT_UPPER_BOUND - WEIGHT_LOWER_BOUND) / 2 * SLIGHT_WEIGHT_MUTATION_STD_VAR_MULTIPLIER
 
 # ----------------------------------------------- Genome ---------------------------------------------------------------
+# Debug
+"""
+Print the Nodes in evaluation order at each call to Genome.think
+"""
+DEBUG = False                               # Default : False
+
 # Drawing : Colors
 """
 Colors are in HSV where each value is between 0 and 1
@@ -58,3 +64,50 @@ MUTATION_CHANGE_ALL_WEIGHT = 0.80           # Default : 0.80
 MUTATION_CHANCE_ADD_CONNECTION = 0.05       # Default : 0.05
 MUTATION_CHANCE_ADD_NODE = 0                # Default : ?
 
+# Mutation : add connection
+"""
+# of random (input, output) pairs tried before looking at every possible pair
+"""
+MUTATION_ADD_CONNECTION_TRIES = 20          # Default : 20
+
+# Crossover
+"""
+Chance for a gene to be disabled in the child if it is disabled in either parent
+"""
+CROSSOVER_DISABLED = 0.75                   # Default : 0.75
+
+# Plan : sparse layers
+"""
+A level of the Plan is stored as a dense matrix if (# Connections) >= SPARSE_DENSITY * (# sources) * (# targets),
+else as CSR arrays evaluated with segment sums, which only pay off for big and very sparse levels
+"""
+SPARSE_DENSITY = 0.01                       # Default : 0.01
+
+# --------------------------------------------- Population -------------------------------------------------------------
+# Speciation
+"""
+Compatibility distance between two genomes as described in http://nn.cs.utexas.edu/downloads/papers/stanley.ec02.pdf (3.3)
+
+distance = EXCESS * E / N + DISJOINT * D / N + WEIGHT * W
+
+E : # of excess genes, D : # of disjoint genes, W : mean weight difference of the matching genes
+N : # of genes of the larger genome, or 1 if both genomes have less than COMPATIBILITY_SMALL_GENOME genes
+"""
+COMPATIBILITY_EXCESS = 1.0                  # Default : 1.0
+COMPATIBILITY_DISJOINT = 1.0                # Default : 1.0
+COMPATIBILITY_WEIGHT = 0.4                  # Default : 0.4
+COMPATIBILITY_SMALL_GENOME = 20             # Default : 20
+COMPATIBILITY_THRESHOLD = 3.0               # Default : 3.0
+
+# Fitness cache
+"""
+# of fitness remembered by a FitnessCache, the least recently used are forgotten first
+"""
+FITNESS_CACHE_SIZE = 100000                 # Default : 100000
+
+# Selection
+"""
+Fraction of the population allowed to reproduce, and # of best genomes copied unchanged into the next generation
+"""
+SURVIVAL_RATE = 0.2                         # Default : 0.2
+ELITISM = 1                                 # Default : 1
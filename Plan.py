@@ -0,0 +1,523 @@
+"""
+Compiled evaluation plan of a Genome
+
+Created by Shinrod at 18/10/2026
+"""
+from math import exp
+from Layer import Layer
+from Node import Node
+import numpy as np
+
+
+class Plan:
+    """
+    Flat, topologically sorted execution plan of a Genome.
+
+    The Genome is pruned first (see Plan.prune()) : the Nodes that can't change the outputs are dropped,
+    and the kept Nodes are numbered in this order : inputs, bias, hidden, outputs
+    (the Nodes added by a mutation after the compilation come after them, see Plan.update()).
+    Every non sensor Node is evaluated once per call, in the order given by self.order.
+    Its inputs are self.sources[self.offsets[k]:self.offsets[k + 1]] weighted by the same slice of self.weights.
+
+    Connections closing a cycle are recurrent (see Genome.sort()) :
+    they read the value their input Node had at the previous call.
+
+    The Nodes are sorted by level (self.level : 1 + the highest level of their non recurrent inputs, sensors are 0).
+    For many samples, every level is evaluated at once, see self.layers : with a dense matrix product,
+    or with segment sums over CSR arrays if the level is big and sparse (see Layer).
+    For one sample, a NumPy call per level costs more than the sums themselves : 'think' goes through
+    self.program in plain Python instead, with the same results.
+
+    After a structural mutation, the Plan of the Genome is made from this one by Plan.update() :
+    only the levels changed by the mutation are built again.
+    """
+
+    # Below that # of Connections, compiling the Genome again is faster than Plan.update()
+    UPDATE = 100
+
+    def __init__(self, genome):
+        """
+        Compile a Genome into a Plan
+
+        Only the enabled Connections of genome.standard_connections and genome.bias_connections are used.
+        The recurrent Connections are the ones found by the Genome, see Genome.sort().
+
+        :param genome: the Genome to compile
+        """
+        genome.sort()
+        nodes = genome.input + [genome.bias] + genome.hidden + genome.output
+        index = {id(node): i for i, node in enumerate(nodes)}
+        n_connections = len(genome.bias_connections) + len(genome.standard_connections)
+        connections = [con for con in genome.bias_connections + genome.standard_connections if con.enabled]
+
+        self.n_inputs = len(genome.input)
+        self.n_sensors = self.n_inputs + 1
+        self.bias = self.n_inputs
+        # # of Nodes of the Genome, the Nodes added after it are found by Plan.update()
+        self.n_genome_nodes = len(nodes)
+
+        # Position in genome's Nodes of each kept Node, and the Connections between the kept Nodes
+        genome_in = [index[id(con.node_in)] for con in connections]
+        genome_out = [index[id(con.node_out)] for con in connections]
+        self.kept, con_in, con_out, weights, recurrent, self.reached = \
+            Plan.prune(len(nodes), self.n_sensors, len(genome.output), genome_in, genome_out,
+                       [con.weight for con in connections], [con.recurrent for con in connections])
+        # The genome's Connections between two kept Nodes are used, even if they were merged or a folded constant
+        # was added to them : the others are pruned (disabled ones included)
+        kept = np.zeros(len(nodes), dtype=bool)
+        kept[self.kept] = True
+        self.pruned_nodes = len(nodes) - len(self.kept)
+        self.pruned_connections = n_connections - int(np.count_nonzero(kept[genome_in] & kept[genome_out]))
+
+        n_nodes = len(self.kept)
+        self.outputs = np.arange(n_nodes - len(genome.output), n_nodes)
+        # Non sensor Nodes by level of the Genome, every feed forward Connection goes to a higher level
+        level = [nodes[i].level for i in self.kept[self.n_sensors:]]
+        self.order = self.n_sensors + np.argsort(level, kind='stable').astype(np.int64)
+
+        # Group the connections by output Node, following the evaluation order
+        inward = [[] for _ in range(n_nodes)]
+        for k, node in enumerate(con_out):
+            inward[node].append(k)
+        grouped = [k for node in self.order for k in inward[node]]
+
+        self.offsets = np.zeros(len(self.order) + 1, dtype=np.int64)
+        self.offsets[1:] = np.cumsum([len(inward[node]) for node in self.order])
+        self.sources = np.array([con_in[k] for k in grouped], dtype=np.int64)
+        self.weights = np.array([weights[k] for k in grouped], dtype=np.float64)
+        self.recurrent = np.array([recurrent[k] for k in grouped], dtype=bool)
+
+        # Value of every Node, kept between two calls for the recurrent Connections
+        self.values = np.zeros(n_nodes)
+        # Value of every Node in every environment, kept between two calls to 'step'
+        self.state = None
+
+        # Sort the Nodes by level : each level is a slice of self.order
+        self.level = self.levels()
+        self.reorder(self.order[np.argsort(self.level[self.order], kind='stable')])
+        self.layers = self.build_layers(genome.config.SPARSE_DENSITY)
+        self.program = self.build_program()
+
+    # ----------------------------------------------- THINK ------------------------------------------------------------
+    def think(self, inputs):
+        """
+        Evaluate the plan
+
+        :param inputs: inputs given to the network
+
+        :return: the values of the output Nodes
+        """
+        values = self.values
+        values[:self.n_inputs] = inputs
+        values[self.bias] = 1
+
+        # Current values, then the values at the beginning of the call in reverse order (see Plan.build_program())
+        current = values.tolist()
+        current += current[::-1]
+        for node, sources, weights in self.program:
+            total = 0.0
+            for source, weight in zip(sources, weights):
+                total += weight * current[source]
+            # Same as Node.sigmoid(), exp(709) is close to the largest float
+            current[node] = 1 / (1 + exp(min(-4.9 * total, 709.0)))
+
+        values[:] = current[:len(values)]
+        return values[self.outputs].tolist()
+
+    def think_batch(self, inputs):
+        """
+        Evaluate the plan on many samples at once, level by level
+
+        Every row gives the same result as 'think' would from the current state.
+        The recurrent Connections read the values left by the last call to 'think', which are not modified.
+
+        :param inputs: array of shape (n_samples, # of inputs)
+
+        :return: array of shape (n_samples, # of outputs)
+        """
+        inputs = np.asarray(inputs, dtype=np.float64)
+        values = np.empty((len(inputs), len(self.values)))
+        values[:] = self.values
+        values[:, :self.n_inputs] = inputs
+        values[:, self.bias] = 1
+
+        for layer in self.layers:
+            values[:, layer.targets] = Node.sigmoid(layer.evaluate(values))
+
+        return values[:, self.outputs]
+
+    def step(self, inputs):
+        """
+        Make one time step in many environments at once
+
+        Each environment has its own state : the recurrent Connections read the values of the previous step
+        of the same environment (0 at the first step).
+
+        :param inputs: array of shape (n_environments, # of inputs)
+
+        :return: array of shape (n_environments, # of outputs)
+        """
+        inputs = np.asarray(inputs, dtype=np.float64)
+        if self.state is None:
+            self.state = np.zeros((len(inputs), len(self.values)))
+        elif len(self.state) != len(inputs):
+            raise ValueError("The # of environments changed, call reset() first")
+        values = self.state
+        values[:, :self.n_inputs] = inputs
+        values[:, self.bias] = 1
+
+        for layer in self.layers:
+            values[:, layer.targets] = Node.sigmoid(layer.evaluate(values))
+
+        return values[:, self.outputs].copy()
+
+    def reset(self):
+        """
+        Forget the state kept for the recurrent Connections by 'think' and 'step'
+        """
+        self.values[:] = 0
+        self.state = None
+
+    # ----------------------------------------------- UPDATE -----------------------------------------------------------
+    def update(self, genome, added, removed = None):
+        """
+        Make the Plan of the Genome after a structural mutation, from this Plan
+
+        It is possible if the Plan has at least UPDATE Connections and the mutation doesn't change the pruning :
+        the new Connections join Nodes that are kept and reached from the sensors, or new Nodes fed by such Nodes
+        and feeding such Nodes (they are kept too), and the removed Connection is replaced by a path of
+        new Connections (see Genome.mutation_add_node()).
+        Then :
+        - The new Connections go after the inputs of their output Node, except the one from a new Node to the output
+          Node of the removed Connection, which takes its place.
+        - The levels of the Nodes downstream of the new feed forward Connections are raised, like in Genome.insert().
+        - Only the Layers of the levels whose Nodes or Connections changed are built again, and only the entries
+          of self.program of the Nodes whose inputs or level changed, or whose recurrent inputs changed level.
+        This Plan is not modified, the new Plan shares the arrays and Layers that didn't change.
+        Like a new Plan, it starts with no state.
+
+        Used by :
+        Genome.update_plan()
+
+        :param genome: the mutated Genome, sorted (see Genome.sort())
+        :param added: the new enabled Connections
+        :param removed: the Connection disabled by the mutation, or None
+
+        :return: the new Plan, or None if the Genome must be compiled again
+        """
+        if len(self.sources) < Plan.UPDATE:
+            return None
+        nodes = genome.input + [genome.bias] + genome.hidden + genome.output
+        n_new = len(nodes) - self.n_genome_nodes
+        n_old = len(self.values)
+        # The new Nodes are the last hidden Nodes of the Genome, they get the last indices of the Plan
+        first_new = len(nodes) - len(genome.output) - n_new
+        kept = np.concatenate([np.where(self.kept >= first_new, self.kept + n_new, self.kept),
+                               np.arange(first_new, first_new + n_new)])
+        # Index in the Plan of every Node of the Genome, -1 if it is dropped
+        where = np.full(len(nodes), -1, dtype=np.int64)
+        where[kept] = np.arange(len(kept))
+        index = {id(node): i for i, node in enumerate(nodes)}
+
+        def plan_index(node):
+            return int(where[index[id(node)]])
+
+        ends = [(plan_index(con.node_in), plan_index(con.node_out)) for con in added]
+        pairs = ends + ([(plan_index(removed.node_in), plan_index(removed.node_out))] if removed is not None else [])
+        new = set(range(n_old, n_old + n_new))
+        if any(node < 0 or (node < n_old and not self.reached[node]) for pair in pairs for node in pair) \
+                or new - {o for i, o in ends if i < n_old} or new - {i for i, o in ends if o < n_old} \
+                or len(set(ends)) < len(ends):
+            return None
+
+        position = np.empty(n_old, dtype=np.int64)
+        position[self.order] = np.arange(len(self.order))
+
+        def inputs(node):
+            k = position[node]
+            return self.sources[self.offsets[k]:self.offsets[k + 1]]
+
+        if any(o < n_old and (inputs(o) == i).any() for i, o in ends):
+            return None
+        sources, weights, recurrent = self.sources, self.weights, self.recurrent
+        replacement = None
+        if removed is not None:
+            i, o = pairs[-1]
+            found = np.flatnonzero(inputs(o) == i)
+            replacement = next((k for k, (source, target) in enumerate(ends) if target == o and source >= n_old), None)
+            if len(found) != 1 or self.weights[self.offsets[position[o]] + found[0]] != removed.weight \
+                    or replacement is None:
+                return None
+            row = self.offsets[position[o]] + found[0]
+            sources, weights, recurrent = sources.copy(), weights.copy(), recurrent.copy()
+            sources[row] = ends[replacement][0]
+            weights[row] = added[replacement].weight
+            recurrent[row] = added[replacement].recurrent
+
+        # The other new Connections go after the inputs of their output Node, the new Nodes after the other Nodes
+        inserted = [k for k in range(len(added)) if k != replacement and ends[k][1] < n_old]
+        appended = sorted((k for k in range(len(added)) if ends[k][1] >= n_old), key=lambda k: ends[k][1])
+        at = self.offsets[position[[ends[k][1] for k in inserted]] + 1]
+        counts = np.diff(self.offsets)
+        np.add.at(counts, position[[ends[k][1] for k in inserted]], 1)
+        counts = np.concatenate([counts, np.bincount([ends[k][1] - n_old for k in appended], minlength=n_new)])
+
+        plan = Plan.__new__(Plan)
+        plan.__dict__.update(self.__dict__)
+        plan.sources = np.concatenate([np.insert(sources, at, [ends[k][0] for k in inserted]),
+                                       np.array([ends[k][0] for k in appended], dtype=np.int64)])
+        plan.weights = np.concatenate([np.insert(weights, at, [added[k].weight for k in inserted]),
+                                       np.array([added[k].weight for k in appended], dtype=np.float64)])
+        plan.recurrent = np.concatenate([np.insert(recurrent, at, [bool(added[k].recurrent) for k in inserted]),
+                                         np.array([bool(added[k].recurrent) for k in appended], dtype=bool)])
+        plan.order = np.concatenate([self.order, np.arange(n_old, n_old + n_new)])
+        plan.offsets = np.zeros(len(plan.order) + 1, dtype=np.int64)
+        np.cumsum(counts, out=plan.offsets[1:])
+        plan.kept = kept
+        plan.reached = np.concatenate([self.reached, np.ones(n_new, dtype=bool)])
+        plan.n_genome_nodes = len(nodes)
+        plan.pruned_connections = self.pruned_connections + (removed is not None)
+        plan.values = np.zeros(n_old + n_new)
+        plan.state = None
+
+        # Raise the levels downstream of the new feed forward Connections, following the feed forward Connections
+        # of the Genome between kept Nodes
+        level = np.concatenate([self.level, np.zeros(n_new, dtype=np.int64)]).tolist()
+        # Level before the update of each raised Node
+        raised = {node: 0 for node in new}
+        for con, (i, o) in zip(added, ends):
+            if con.recurrent or level[o] > level[i]:
+                continue
+            raised.setdefault(o, level[o])
+            level[o] = level[i] + 1
+            stack = [o]
+            while stack:
+                node = stack.pop()
+                for out in nodes[kept[node]].outward_connections:
+                    target = plan_index(out.node_out) if out.recurrent is False and out.enabled else -1
+                    if target >= 0 and level[target] <= level[node]:
+                        raised.setdefault(target, level[target])
+                        level[target] = level[node] + 1
+                        stack.append(target)
+        plan.level = np.array(level, dtype=np.int64)
+        plan.reorder(plan.order[np.argsort(plan.level[plan.order], kind='stable')])
+
+        # Nodes whose entry of self.program changes, and levels whose Layer changes
+        changed = set(raised) | {o for _, o in pairs}
+        for node in raised:
+            if node < n_old:
+                for out in nodes[kept[node]].outward_connections:
+                    if out.recurrent and out.enabled and plan_index(out.node_out) >= 0:
+                        changed.add(plan_index(out.node_out))
+        dirty = {level[node] for node in changed} | {old for node, old in raised.items() if node < n_old}
+        bounds = np.searchsorted(plan.level[plan.order], np.arange(1, plan.level.max(initial=0) + 2))
+        plan.layers = [self.layers[k] if k + 1 not in dirty and k < len(self.layers)
+                       else plan.build_layer(bounds[k], bounds[k + 1], genome.config.SPARSE_DENSITY)
+                       for k in range(len(bounds) - 1)]
+        entries = {entry[0]: entry for entry in self.program}
+        entries.update((entry[0], entry) for entry in plan.build_program(np.array(sorted(changed), dtype=np.int64)))
+        plan.program = [entries[node] for node in plan.order.tolist()]
+        return plan
+
+    def copy(self):
+        """
+        Copy the Plan, for a clone of its Genome
+
+        The arrays, Layers and lists are shared : they are never modified in place (Plan.update() makes new ones).
+        Like a new Plan, the copy starts with no state.
+
+        :return: a new Plan
+        """
+        copy = Plan.__new__(Plan)
+        copy.__dict__.update(self.__dict__)
+        copy.values = np.zeros(len(self.values))
+        copy.state = None
+        return copy
+
+    # ------------------------------------------------ TOOL ------------------------------------------------------------
+    def levels(self):
+        """
+        Level of every Node : 1 + the highest level of its non recurrent inputs, 0 for the sensors
+
+        self.order must be a topological order of the non recurrent Connections.
+
+        :return: array of the levels
+        """
+        level = np.zeros(len(self.values), dtype=np.int64)
+        for k, node in enumerate(self.order):
+            begin, end = self.offsets[k], self.offsets[k + 1]
+            feed_forward = self.sources[begin:end][~self.recurrent[begin:end]]
+            level[node] = level[feed_forward].max(initial=0) + 1
+        return level
+
+    def reorder(self, order):
+        """
+        Change the evaluation order, the inputs of each Node move with it
+
+        :param order: array of the non sensor Nodes in the new order
+
+        :return: None
+        """
+        position = np.empty(len(self.values), dtype=np.int64)
+        position[self.order] = np.arange(len(self.order))
+        k = position[order]
+        counts = self.offsets[k + 1] - self.offsets[k]
+        rows = Plan.ranges(self.offsets[k], self.offsets[k + 1])
+        self.offsets = np.zeros(len(order) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        self.order = order
+        self.sources, self.weights, self.recurrent = self.sources[rows], self.weights[rows], self.recurrent[rows]
+
+    def build_layers(self, density : float = Layer.DENSITY):
+        """
+        Make one Layer per level, dense or sparse according to the density of its Connections
+
+        :param density: a Layer is dense if (# Connections) >= density * (# sources) * (# targets)
+
+        :return: list of Layer, the k-th one computes the Nodes of level k + 1
+        """
+        bounds = np.searchsorted(self.level[self.order], np.arange(1, self.level.max(initial=0) + 2))
+        return [self.build_layer(bounds[k], bounds[k + 1], density) for k in range(len(bounds) - 1)]
+
+    def build_layer(self, begin : int, end : int, density : float = Layer.DENSITY):
+        """
+        Make the Layer computing the Nodes self.order[begin:end], they must have the same level
+
+        :param begin: position of the first Node in self.order
+        :param end: position of the last Node in self.order + 1
+        :param density: the Layer is dense if (# Connections) >= density * (# sources) * (# targets)
+
+        :return: a Layer
+        """
+        rows = slice(self.offsets[begin], self.offsets[end])
+        columns = np.repeat(np.arange(end - begin), np.diff(self.offsets[begin:end + 1]))
+        return Layer.build(self.order[begin:end], self.sources[rows], columns, self.weights[rows], density)
+
+    def build_program(self, nodes = None):
+        """
+        Make the entries of self.program evaluated by 'think' : (Node, its sources, their weights)
+
+        A Layer reads all its sources before writing its targets : a recurrent Connection from a Node of the same
+        level (or higher) reads the value that Node had at the beginning of the call.
+        'think' keeps those values after the current ones, in reverse order : the source s of such a Connection
+        is given as ~s (= -1 - s), which reads them from the end of the list whatever the # of Nodes.
+
+        :param nodes: array of the Nodes (default : all of them, in evaluation order)
+
+        :return: list of (index of the Node, list of the indices of its sources, list of their weights)
+        """
+        if nodes is None:
+            nodes = self.order
+        position = np.empty(len(self.values), dtype=np.int64)
+        position[self.order] = np.arange(len(self.order))
+        k = position[nodes]
+        counts = self.offsets[k + 1] - self.offsets[k]
+        rows = Plan.ranges(self.offsets[k], self.offsets[k + 1])
+        sources = self.sources[rows]
+        stale = self.recurrent[rows] & (self.level[sources] >= np.repeat(self.level[nodes], counts))
+        sources = np.where(stale, ~sources, sources).tolist()
+        weights = self.weights[rows].tolist()
+        ends = np.cumsum(counts).tolist()
+        return [(node, sources[end - count:end], weights[end - count:end])
+                for node, end, count in zip(nodes.tolist(), ends, counts.tolist())]
+
+    @staticmethod
+    def ranges(begin, end):
+        """
+        Concatenation of np.arange(begin[k], end[k]) for every k
+
+        :param begin: array of the first value of each range
+        :param end: array of the last value + 1 of each range
+
+        :return: array of the values
+        """
+        lengths = end - begin
+        return np.arange(lengths.sum()) + np.repeat(begin - np.cumsum(lengths) + lengths, lengths)
+
+    @staticmethod
+    def prune(n_nodes, n_sensors, n_outputs, con_in, con_out, weights, recurrent):
+        """
+        Drop the hidden Nodes that can't change the outputs, and their Connections
+
+        - A hidden Node that can't reach an output is dropped.
+        - A hidden Node that can't be reached from the sensors computes a constant (the same at every call),
+          unless it is in a cycle : it is dropped and its constant is added to the bias weight of the kept Nodes
+          it feeds. If there is a cycle amongst those Nodes, they are all kept.
+
+        :param n_nodes: # of Nodes, numbered inputs, bias, hidden, outputs
+        :param n_sensors: # of sensors (inputs and bias)
+        :param n_outputs: # of outputs
+        :param con_in: index of the input Node of each Connection
+        :param con_out: index of the output Node of each Connection
+        :param weights: weight of each Connection
+        :param recurrent: True for each recurrent Connection
+
+        :return: (index of the kept Nodes, then con_in, con_out, weights and recurrent of the kept Connections,
+                  with the kept Nodes numbered in the same order from 0,
+                  then True for each kept Node reached from the sensors)
+        """
+        outward = [[] for _ in range(n_nodes)]
+        inward = [[] for _ in range(n_nodes)]
+        for k, (i, o) in enumerate(zip(con_in, con_out)):
+            outward[i].append(k)
+            inward[o].append(k)
+
+        def search(roots, edges, ends):
+            found = [False] * n_nodes
+            stack = list(roots)
+            for node in stack:
+                found[node] = True
+            while stack:
+                for k in edges[stack.pop()]:
+                    node = ends[k]
+                    if not found[node]:
+                        found[node] = True
+                        stack.append(node)
+            return found
+
+        first_output = n_nodes - n_outputs
+        reached = search(range(n_sensors), outward, con_out)
+        useful = search(range(first_output, n_nodes), inward, con_in)
+        kept = [node < n_sensors or node >= first_output or (reached[node] and useful[node])
+                for node in range(n_nodes)]
+
+        # The Nodes not reached from the sensors only have inputs not reached either : evaluate them once,
+        # in topological order, if there is no cycle amongst them
+        constant = [node for node in range(n_sensors, n_nodes) if not reached[node]]
+        missing = {node: len(inward[node]) for node in constant}
+        ready = [node for node in constant if missing[node] == 0]
+        value = [0.0] * n_nodes
+        for node in ready:
+            value[node] = Node.sigmoid(sum(weights[k] * value[con_in[k]] for k in inward[node]))
+            for k in outward[node]:
+                if con_out[k] in missing:
+                    missing[con_out[k]] -= 1
+                    if missing[con_out[k]] == 0:
+                        ready.append(con_out[k])
+        if len(ready) < len(constant):
+            for node in constant:
+                kept[node] = kept[node] or useful[node]
+            ready = []
+
+        # Bias weight added to the kept Nodes fed by a dropped constant Node
+        folded = {}
+        for node in ready:
+            if not kept[node]:
+                for k in outward[node]:
+                    if kept[con_out[k]]:
+                        folded[con_out[k]] = folded.get(con_out[k], 0.0) + weights[k] * value[node]
+
+        new_index = (np.cumsum(kept) - 1).tolist()
+        bias = n_sensors - 1
+        # (input, output) -> [weight, recurrent]
+        connections = {}
+        for i, o, weight, loop in zip(con_in, con_out, weights, recurrent):
+            if kept[i] and kept[o]:
+                connections.setdefault((new_index[i], new_index[o]), [0.0, loop])[0] += weight
+        for node, weight in folded.items():
+            connections.setdefault((bias, new_index[node]), [0.0, False])[0] += weight
+
+        kept = np.flatnonzero(kept)
+        return (kept, [i for i, _ in connections], [o for _, o in connections],
+                [weight for weight, _ in connections.values()], [loop for _, loop in connections.values()],
+                np.array(reached, dtype=bool)[kept])
@@ -3,7 +3,22 @@ Population gathering multiple genomes
 
 Created by Shinrod at 09/05/2020
 """
+from CompatibilityTable import CompatibilityTable
+import copy
+from Config import Config
+from FitnessCache import FitnessCache
+from functools import partial
+import json
+import os
 from Genome import Genome
+from GenomeList import GenomeList
+from GenomeTable import GenomeTable
+from InnovationRegistry import InnovationRegistry
+from PopulationPlan import PopulationPlan
+from Profiler import Profiler
+from Species import Species
+from Worker import Worker
+import numpy as np
 
 
 class Population:
@@ -16,6 +31,8 @@ class Population:
                  inputs : int = None,
                  outputs : int = None,
                  first_connections : int = 1,
+                 config : Config = None,
+                 seed : int = None,
                  __other = None):
         """
         Make a Population.
@@ -33,32 +50,611 @@ class Population:
         :param inputs: # of inputs in the neural network
         :param outputs: # of outputs in the neural network
         :param first_connections: # of connections the NN is starting with (must be between 0 and inputs included)
+        :param config: parameters of NEAT, given to every Genome (default : Config.default())
+        :param seed: seed of every random draw of the Population, the same seed gives the same run (default : random)
 
         :param __other: Use that parameter alone to clone a Population
         """
+        # Packed plans of the people, rebuilt when one of their plans has changed
+        self._plan = None
+        self.species = []
+
         if __other is None:
             # Create a brand new population
+            self.config = config or Config.default()
+            # Random draws of the whole Population, and origin of the random streams of the Genome
+            self.seed_sequence = np.random.SeedSequence(seed)
+            self.rng = np.random.default_rng(self.seed_sequence)
             self.demography = demography
-            self.people = [Genome(inputs, outputs, first_connections) for _ in range(demography)]
+            self.registry = InnovationRegistry(inputs + 1 + outputs)
+            sequence = self.seed_sequence.spawn(1)[0]
+            self.people = [Genome(inputs, outputs, first_connections, self.registry, self.config,
+                                  Population.stream(sequence, i))
+                           for i in range(demography)]
         else:
             # Clone that population
+            self.config = __other.config
+            self.seed_sequence = copy.deepcopy(__other.seed_sequence)
+            self.rng = copy.deepcopy(__other.rng)
             self.demography = __other.demography
+            self.registry = __other.registry.clone()
+            self.species = [Species(species.innovations, species.weights) for species in __other.species]
             self.people = [genome.clone() for genome in __other.people]
 
+    # ----------------------------------------------- THINK ------------------------------------------------------------
+    def evaluate(self, inputs):
+        """
+        Use the neural network of every Genome on many samples at once
+
+        :param inputs: array of shape (n_samples, # of inputs)
+
+        :return: array of shape (demography, n_samples, # of outputs)
+        """
+        return self.plan.think_batch(inputs)
+
+    def evaluate_parallel(self, fitness_fn, workers : int = None, seed : int = None, cache : FitnessCache = None,
+                          network : bool = False):
+        """
+        Compute the fitness of every Genome on several processes
+
+        Each worker receives the CompactGenome of the Genome it evaluates, not the Node / Connection graph,
+        or with network, the Network made by Genome.export() : the workers then only import Worker and Network,
+        which makes them start faster (see Benchmark.py, 'startup').
+        With the same seed, the result doesn't depend on the # of workers.
+
+        With a cache, a Genome with the same Genome.content_hash() as a Genome evaluated before
+        (in this call or in a previous one) isn't evaluated again.
+
+        :param fitness_fn: picklable function (Genome) -> fitness, or (Network) -> fitness with network,
+                           it must be defined at the top level of a module
+        :param workers: # of processes (default : # of CPU), with 1 the Genomes are evaluated in this process
+        :param seed: if given, np.random is seeded with (seed, index of the Genome) before each evaluation
+        :param cache: FitnessCache used with that fitness_fn
+        :param network: if True, fitness_fn receives the exported Network instead of the Genome
+
+        :return: list of the fitness, in the order of self.people
+        """
+        if cache is None:
+            keys = fitness = None
+            indices = list(range(len(self.people)))
+        else:
+            keys = self.content_hashes()
+            fitness, missing = cache.get_many(keys)
+            indices = list(missing.values())
+
+        if network:
+            task = partial(Worker.evaluate_network, fitness_fn, seed)
+            items = [self.people[i].export() for i in indices]
+        else:
+            task = partial(Worker.evaluate_code, fitness_fn, seed, self.config)
+            codes = self.compacts()
+            items = [codes[i] for i in indices]
+        results = self.evaluate_tasks(task, workers, indices, items)
+        if cache is None:
+            return results
+
+        computed = dict(zip(missing, results))
+        for key, value in computed.items():
+            cache.put(key, value)
+        return [computed[key] if value is None else value for key, value in zip(keys, fitness)]
+
+    @staticmethod
+    def evaluate_tasks(task, workers, indices, items):
+        """
+        Run an evaluation task of Worker on several processes
+
+        The processes only import Worker and the modules needed to unpickle the items,
+        ProcessPoolExecutor itself is only imported when it is needed.
+
+        Used by :
+        Population.evaluate_parallel()
+
+        :param task: function (index, item) -> fitness, a partial of a Worker method
+        :param workers: # of processes (default : # of CPU)
+        :param indices: index of each Genome in the Population
+        :param items: CompactGenome or Network of each Genome
+
+        :return: list of the fitness, in the order of items
+        """
+        if workers is None:
+            workers = os.cpu_count()
+        if workers == 1 or len(items) <= 1:
+            return list(map(task, indices, items))
+
+        from concurrent.futures import ProcessPoolExecutor
+        # Big chunks to keep the inter process communication low, a few per worker to balance the load
+        chunksize = max(1, len(items) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(task, indices, items, chunksize=chunksize))
+
+    @property
+    def plan(self):
+        """
+        Packed plans of the people, rebuilt only after one of the Genome has changed
+
+        :return: the PopulationPlan of this Population
+        """
+        plans = [genome.plan for genome in self.people]
+        if self._plan is None or len(self._plan.plans) != len(plans) \
+                or any(old is not new for old, new in zip(self._plan.plans, plans)):
+            self._plan = PopulationPlan(plans)
+        return self._plan
+
     # ----------------------------------------------- GENETIC ----------------------------------------------------------
     def mutate(self):
         """
         Mutate all the Genome in the Population
 
-        :return:
+        The same mutation in two Genome of that generation gets the same innovation number.
+        Which Genome get a structural mutation is drawn at once with self.rng, then each of them draws the details
+        of its mutation from its own stream (see Population.stream()). At the end, the new Nodes and Connections
+        are numbered again in an order that only depends on which mutations happened
+        (see InnovationRegistry.renumber()), so the result doesn't depend on the order the Genome are mutated in.
+
+        :return: None
         """
-        innovation_history = []
-        for genome in self.people:
-            genome.mutate(innovation_history)
+        self.registry.reset()
+        first_node_name, first_innovation = self.registry.next_node_name, self.registry.next_innovation
+        self.mutate_weights()
+
+        config = self.config
+        draws = self.rng.random((len(self.people), 2))
+        add_connection = draws[:, 0] < config.MUTATION_CHANCE_ADD_CONNECTION
+        add_node = draws[:, 1] < config.MUTATION_CHANCE_ADD_NODE
+        sequence = self.seed_sequence.spawn(1)[0]
+        mutated = np.flatnonzero(add_connection | add_node).tolist()
+        for i in mutated:
+            genome, rng = self.people[i], Population.stream(sequence, i)
+            if add_connection[i]:
+                genome.mutation_add_connection(self.registry, rng=rng)
+            if add_node[i]:
+                genome.mutation_add_node(self.registry, rng)
+
+        names, innovations = self.registry.renumber(first_node_name, first_innovation)
+        if names or innovations:
+            for i in mutated:
+                self.people[i].renumber(names, innovations)
+
+    @staticmethod
+    def stream(sequence, i : int):
+        """
+        Random stream of the i-th Genome
+
+        It is the generator of sequence.spawn(i + 1)[i], made without spawning the i first children :
+        only the Genome that need random numbers pay for their stream.
+
+        :param sequence: np.random.SeedSequence of the generation
+        :param i: index of the Genome
+
+        :return: a np.random.Generator
+        """
+        return np.random.default_rng(np.random.SeedSequence(sequence.entropy, spawn_key=sequence.spawn_key + (i,)))
+
+    def mutate_weights(self):
+        """
+        Mutate the weights of all the Genome at once
+
+        Same as the weight mutation of Genome.mutate(), but all the random numbers are drawn with a few calls to self.rng
+        and the weights are changed with array operations.
+
+        :return: None
+        """
+        chosen = [genome for genome, draw in zip(self.people, self.rng.random(len(self.people)))
+                  if draw < self.config.MUTATION_CHANGE_ALL_WEIGHT]
+        connections = [con for genome in chosen for con in genome.standard_connections + genome.bias_connections]
+        n = len(connections)
+        config = self.config
+
+        weights = np.fromiter((con.weight for con in connections), dtype=np.float64, count=n)
+        slight = np.clip(weights + self.rng.normal(0, config.SLIGHT_WEIGHT_MUTATION_STD_VAR, n),
+                         config.WEIGHT_LOWER_BOUND, config.WEIGHT_UPPER_BOUND)
+        new = self.rng.uniform(config.WEIGHT_LOWER_BOUND, config.WEIGHT_UPPER_BOUND, n)
+        weights = np.where(self.rng.random(n) < config.MUTATION_NEW_WEIGHT, new, slight)
+
+        for con, weight in zip(connections, weights.tolist()):
+            con.weight = weight
+        for genome in chosen:
+            genome.invalidate_plan()
+
+    def speciate(self, chunk : int = 2048, block : int = 64):
+        """
+        Put every Genome in a Species
+
+        A Genome goes in the first Species whose representative is closer than COMPATIBILITY_THRESHOLD,
+        or makes a new Species with itself as representative.
+        The remaining Genome are compared at once to a block of representatives of the previous generation,
+        those that found their Species are not compared to the next blocks.
+        Then the first remaining Genome are compared to each other, to find which of them make new Species,
+        and all the other remaining Genome are compared at once to those new Species.
+        The empty Species are removed, and each Species takes a random member as representative for the next call.
+
+        :param chunk: maximum # of Genome compared at once
+        :param block: # of representatives compared at once
+
+        :return: None
+        """
+        genes = [genome.genes() for genome in self.people]
+        innovations = np.unique(np.concatenate([np.zeros(0, dtype=np.int64)]
+                                               + [innovations for innovations, _ in genes]
+                                               + [species.innovations for species in self.species]))
+        table = CompatibilityTable(innovations, self.config)
+        ranks, weights, lengths = CompatibilityTable.pad([(table.rank(innovations), genome_weights)
+                                                          for innovations, genome_weights in genes])
+        # Bound the memory used by the padded genes of the compared Genome
+        chunk = max(1, min(chunk, CompatibilityTable.BLOCK // max(ranks.shape[1], 1)))
+        threshold = self.config.COMPATIBILITY_THRESHOLD
+
+        def assign(begin, end, remaining):
+            # Put the remaining Genome in the first close Species amongst begin, ..., end - 1, return the others
+            for first in range(begin, end, block):
+                last = min(first + block, end)
+                left = [np.zeros(0, dtype=np.int64)]
+                for start in range(0, len(remaining), chunk):
+                    rows = remaining[start:start + chunk]
+                    close = table.distances(ranks[rows], weights[rows], lengths[rows], first, last) < threshold
+                    found, which = close.any(axis=0), close.argmax(axis=0)
+                    for i, k in zip(rows[found].tolist(), which[found].tolist()):
+                        self.species[first + k].members.append(self.people[i])
+                    left.append(rows[~found])
+                remaining = np.concatenate(left)
+            return remaining
+
+        for species in self.species:
+            table.add(species.innovations, species.weights)
+            species.members = []
+        remaining = assign(0, table.size, np.arange(len(self.people)))
+
+        # New Species : amongst the first remaining Genome, each one that is far from the new Species before it
+        # makes a new Species, then the other remaining Genome are compared to all those new Species
+        while len(remaining):
+            candidates = remaining[:block]
+            among = CompatibilityTable(innovations, self.config)
+            for i in candidates:
+                among.add(*genes[i])
+            close = among.distances(ranks[candidates], weights[candidates], lengths[candidates]) < threshold
+            begin = table.size
+            owner = np.full(len(candidates), -1, dtype=np.int64)
+            for k, i in enumerate(candidates.tolist()):
+                if owner[k] < 0:
+                    owner[k] = table.add(*genes[i])
+                    self.species.append(Species(*genes[i]))
+                    owner[close[k] & (owner < 0)] = owner[k]
+            for k, i in enumerate(candidates.tolist()):
+                self.species[owner[k]].members.append(self.people[i])
+            remaining = assign(begin, table.size, remaining[len(candidates):])
+
+        self.species = [species for species in self.species if species.members]
+        for species in self.species:
+            species.innovations, species.weights = species.members[self.rng.integers(len(species.members))].genes()
+
+    def crossover(self, pairs, fitness):
+        """
+        Make many children at once, like Genome.crossover()
+
+        The parents are packed in a GenomeTable, each child starts as a copy of the genes of its fitter parent
+        (the first one of the pair if they are as fit), then the matching genes of all the children are found
+        with a single sort of the (parent, innovation number) keys.
+
+        :param pairs: array (# children, 2) of the indices of the parents in self.people
+        :param fitness: fitness of each Genome of self.people
+
+        :return: GenomeTable of the children, use Population.from_table() or Genome.decode() to get Genome
+        """
+        table = self.compact()
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        fitness = np.asarray(fitness)
+        swap = fitness[pairs[:, 1]] > fitness[pairs[:, 0]]
+        fitter = np.where(swap, pairs[:, 1], pairs[:, 0])
+        weaker = np.where(swap, pairs[:, 0], pairs[:, 1])
+        children = table.take(fitter)
+
+        # Key (genome, innovation number) of every gene of the parents, sorted
+        n_innovations = table.innovations.max(initial=0) + 1
+        owner = np.repeat(np.arange(len(table)), np.diff(table.con_offsets))
+        keys = owner * n_innovations + table.innovations
+        order = np.argsort(keys)
+        keys = keys[order]
+
+        # Look for the genes of the children in their weaker parent
+        child_of_gene = np.repeat(np.arange(len(children)), np.diff(children.con_offsets))
+        query = weaker[child_of_gene] * n_innovations + children.innovations
+        position = np.minimum(np.searchsorted(keys, query), len(keys) - 1)
+        matching = keys[position] == query if len(keys) else np.zeros(len(query), dtype=bool)
+        weaker_genes = order[position]
+
+        n = len(query)
+        from_weaker = matching & (self.rng.random(n) < 0.5)
+        children.weights[from_weaker] = table.weights[weaker_genes[from_weaker]]
+        disabled = ~children.enabled | (matching & ~table.enabled[weaker_genes])
+        children.enabled = ~(disabled & (self.rng.random(n) < self.config.CROSSOVER_DISABLED))
+        # The children keep the recurrent flags of the fitter parent, the flags of the genes it didn't have enabled
+        # are found when the child is sorted (see Genome.sort())
+        children.recurrent[~children.enabled] = -1
+        return children
+
+    # ------------------------------------------------ RUN -------------------------------------------------------------
+    def run(self, fitness_stream, max_fitness, generations : int = None, cache : FitnessCache = None):
+        """
+        Evolve that Population, one generation at a time
+
+        Each generation, fitness_stream(generation) gives the batches the Genome are evaluated on,
+        as an iterable of (inputs, score, bound) :
+        - inputs : array (n_samples, # of inputs)
+        - score : function taking the outputs (# genomes, n_samples, # of outputs) of the evaluated Genome
+                  and returning the fitness (>= 0) each of them earns on this batch
+        - bound : the highest fitness a Genome can earn on this batch
+
+        A Genome stops being evaluated as soon as it can't reach the fitness needed to reproduce.
+        With a cache, a Genome whose fitness is cached (an elite, or a child identical to a Genome evaluated before)
+        isn't evaluated again, see Population.evaluate_stream().
+        The statistics tell how many Nodes and Connections the Plans of the evaluated generation didn't need.
+        If a Profiler is enabled, its report of the generation is added to the statistics.
+
+        Use it like this :
+        for stats in population.run(fitness_stream, max_fitness, generations):
+            print(stats)
+
+        :param fitness_stream: function (generation) -> iterable of (inputs, score, bound)
+        :param max_fitness: sum of the bounds of all the batches of a generation
+        :param generations: # of generations, or None to run until the caller stops
+        :param cache: FitnessCache used with that fitness_stream, only if it gives the same batches every generation
+
+        :return: a generator yielding a dict of statistics after each generation
+        """
+        generation = 0
+        while generations is None or generation < generations:
+            fitness, evaluated = self.evaluate_stream(fitness_stream(generation), max_fitness, cache)
+            best = int(np.argmax(fitness))
+            stats = {'generation': generation,
+                     'best': fitness[best],
+                     'mean': fitness.mean(),
+                     'champion': self.people[best],
+                     'evaluated': evaluated,
+                     'pruned': self.pruned()}
+            self.reproduce(fitness)
+            if Profiler.active is not None:
+                stats['profile'] = Profiler.active.report()
+            yield stats
+            generation += 1
+
+    def evaluate_stream(self, batches, max_fitness, cache : FitnessCache = None):
+        """
+        Compute the fitness of every Genome on a stream of batches, see Population.run()
+
+        After each batch, the Genome whose fitness plus the bounds of the remaining batches is lower than
+        the fitness of the worst reproducing Genome so far are not evaluated on the next batches.
+
+        With a cache, a Genome with the same Genome.content_hash() as a Genome evaluated before
+        (in this call or in a previous one) isn't evaluated again : it takes the fitness of that Genome.
+        Only the fitness of the Genome evaluated on every batch is cached, not the one of a Genome that stopped early.
+
+        :param batches: iterable of (inputs, score, bound)
+        :param max_fitness: sum of the bounds of all the batches
+        :param cache: FitnessCache used with these batches
+
+        :return: (fitness of each Genome, fraction of the (Genome, sample) pairs that were evaluated)
+                 The fitness of a Genome that stopped early is the fitness it earned until then.
+        """
+        n = len(self.people)
+        keep = max(1, int(n * self.config.SURVIVAL_RATE))
+        fitness = np.zeros(n)
+        active = np.arange(n)
+        # Genome with the same content as an evaluated Genome, and the index of that Genome
+        copies = sources = np.zeros(0, dtype=np.int64)
+        if cache is not None:
+            keys = self.content_hashes()
+            cached, missing = cache.get_many(keys)
+            fitness[:] = [0 if value is None else value for value in cached]
+            active = np.array(list(missing.values()), dtype=np.int64)
+            copies = np.array([i for i, key in enumerate(keys) if cached[i] is None and missing[key] != i],
+                              dtype=np.int64)
+            sources = np.array([missing[keys[i]] for i in copies], dtype=np.int64)
+        remaining = max_fitness
+        plan = self.plan
+        evaluated = total = 0
+        # Genome evaluated on every batch so far
+        complete = np.zeros(0, dtype=np.int64)
+
+        for inputs, score, bound in batches:
+            if len(active):
+                if len(plan.plans) != len(active):
+                    plan = PopulationPlan([self.people[i].plan for i in active])
+                fitness[active] += score(plan.think_batch(inputs))
+            fitness[copies] = fitness[sources]
+            evaluated += len(active) * len(inputs)
+            total += n * len(inputs)
+            complete = active
+
+            remaining -= bound
+            cutoff = np.partition(fitness, n - keep)[n - keep]
+            active = active[fitness[active] + remaining >= cutoff]
+
+        if cache is not None:
+            for i in complete.tolist():
+                cache.put(keys[i], fitness[i])
+        return fitness, evaluated / max(total, 1)
+
+    def reproduce(self, fitness):
+        """
+        Replace the people by the next generation
+
+        The ELITISM best Genome are copied unchanged, the others are children of two random Genome amongst the best
+        SURVIVAL_RATE of the Population, then mutated.
+
+        :param fitness: fitness of each Genome
+
+        :return: None
+        """
+        order = np.argsort(-np.asarray(fitness), kind='stable')
+        parents = order[:max(1, int(len(order) * self.config.SURVIVAL_RATE))]
+        elite = [self.people[i].clone() for i in order[:self.config.ELITISM]]
+
+        pairs = self.rng.choice(parents, size=(self.demography - len(elite), 2))
+        children = self.crossover(pairs, fitness)
+        self.people = [Genome.decode(children[i], self.config) for i in range(len(children))]
+        self.mutate()
+        self.people = elite + self.people
 
     # ------------------------------------------------ TOOL ------------------------------------------------------------
+    def pruned(self):
+        """
+        # of Nodes and Connections dropped by the pruning of the Plans of every Genome (see Plan.prune())
+
+        :return: (# of Nodes, # of Connections, disabled ones included)
+        """
+        plans = [genome.plan for genome in self.people]
+        return sum(plan.pruned_nodes for plan in plans), sum(plan.pruned_connections for plan in plans)
+
     def clone(self):
         """
         Make a deepcopy of that Population
         """
-        return self.__class__(__other=self)
\ No newline at end of file
+        # __other is name mangled, so it can't be given as a keyword argument
+        return self.__class__(None, None, None, None, None, None, self)
+
+    def compact(self):
+        """
+        Store all the Genome of that Population in arrays, it uses a lot less memory than the Genome objects
+
+        :return: a GenomeTable
+        """
+        return GenomeTable.from_genomes(self.compacts())
+
+    def content_hashes(self):
+        """
+        Genome.content_hash() of every Genome, the Genome of a loaded Population that haven't been accessed
+        aren't decoded
+
+        :return: list of digests
+        """
+        if isinstance(self.people, GenomeList):
+            return self.people.content_hashes()
+        return [genome.content_hash() for genome in self.people]
+
+    def compacts(self):
+        """
+        CompactGenome of every Genome, the Genome of a loaded Population that haven't been accessed aren't decoded
+
+        :return: list of CompactGenome
+        """
+        if isinstance(self.people, GenomeList):
+            return self.people.compacts()
+        return [genome.encode() for genome in self.people]
+
+    def save(self, path):
+        """
+        Save that Population in the directory path
+
+        The Genome are saved as the .npy arrays of a GenomeTable, the Species representatives as .npy arrays too,
+        and the other attributes (with the Config) in population.json.
+        population.json is written last, through a temporary file renamed at the end :
+        an interrupted save never leaves a truncated population.json.
+
+        :param path: directory, it is created if needed
+
+        :return: None
+        """
+        # Encoded before anything is written, so that an attribute JSON can't store doesn't leave a partial save
+        entropy = self.seed_sequence.entropy
+        entropy = int(entropy) if np.ndim(entropy) == 0 else [int(value) for value in entropy]
+        table = self.compact()
+        attributes = json.dumps({'inputs': int(table.inputs),
+                                 'outputs': int(table.outputs),
+                                 'seed_sequence': {'entropy': entropy,
+                                                   'spawn_key': [int(key) for key in self.seed_sequence.spawn_key],
+                                                   'n_children_spawned': int(self.seed_sequence.n_children_spawned)},
+                                 'rng': self.rng.bit_generator.state,
+                                 'next_node_name': int(self.registry.next_node_name),
+                                 'next_innovation': int(self.registry.next_innovation),
+                                 'config': self.config.values()})
+
+        table.save(path)
+        np.save(os.path.join(path, 'species_innovations.npy'),
+                np.concatenate([species.innovations for species in self.species] + [np.empty(0, dtype=np.int64)]))
+        np.save(os.path.join(path, 'species_weights.npy'),
+                np.concatenate([species.weights for species in self.species] + [np.empty(0)]))
+        np.save(os.path.join(path, 'species_offsets.npy'),
+                np.cumsum([0] + [len(species.innovations) for species in self.species]))
+
+        temporary = os.path.join(path, 'population.json.tmp')
+        with open(temporary, 'w') as file:
+            file.write(attributes)
+        os.replace(temporary, os.path.join(path, 'population.json'))
+
+    @classmethod
+    def load(cls, path, mmap : bool = True):
+        """
+        Load a Population saved by Population.save()
+
+        With mmap, the arrays are memory-mapped : loading is instantaneous
+        and each Genome is only read and decoded the first time it is accessed.
+
+        :param path: directory given to Population.save()
+        :param mmap: if True, memory-map the arrays instead of reading them
+
+        :return: the Population
+        """
+        with open(os.path.join(path, 'population.json')) as file:
+            attributes = json.load(file)
+        table = GenomeTable.load(path, attributes['inputs'], attributes['outputs'], mmap)
+
+        population = cls.__new__(cls)
+        population._plan = None
+        population.config = Config(**attributes['config']) if 'config' in attributes else Config.default()
+        if 'seed_sequence' in attributes:
+            sequence = attributes['seed_sequence']
+            population.seed_sequence = np.random.SeedSequence(sequence['entropy'], spawn_key=sequence['spawn_key'],
+                                                              n_children_spawned=sequence['n_children_spawned'])
+            population.rng = np.random.default_rng(population.seed_sequence)
+            population.rng.bit_generator.state = attributes['rng']
+        else:
+            population.seed_sequence = np.random.SeedSequence()
+            population.rng = np.random.default_rng(population.seed_sequence)
+        population.demography = len(table)
+        population.people = GenomeList(table, population.config)
+        population.registry = InnovationRegistry(attributes['next_node_name'], attributes['next_innovation'])
+
+        innovations = np.load(os.path.join(path, 'species_innovations.npy'))
+        weights = np.load(os.path.join(path, 'species_weights.npy'))
+        offsets = np.load(os.path.join(path, 'species_offsets.npy'))
+        population.species = [Species(innovations[begin:end], weights[begin:end])
+                              for begin, end in zip(offsets[:-1], offsets[1:])]
+        return population
+
+    @classmethod
+    def from_table(cls, table : GenomeTable, config : Config = None, seed : int = None):
+        """
+        Rebuild a Population from the result of Population.compact()
+
+        :param table: a GenomeTable
+        :param config: parameters of the Population (default : Config.default())
+        :param seed: seed of the random draws of the Population (default : random)
+
+        :return: a new Population
+        """
+        population = cls.__new__(cls)
+        population._plan = None
+        population.seed_sequence = np.random.SeedSequence(seed)
+        population.rng = np.random.default_rng(population.seed_sequence)
+        population.species = []
+        population.config = config or Config.default()
+        population.demography = len(table)
+        population.people = [Genome.decode(table[i], population.config) for i in range(len(table))]
+        population.registry = InnovationRegistry(max(table.inputs + 1 + table.outputs, table.hidden.max(initial=-1) + 1),
+                                                 table.innovations.max(initial=-1) + 1)
+        return population
+
+# ---------------------------------------------------- TEST ------------------------------------------------------------
+if __name__ == '__main__':
+    import tempfile
+
+    population = Population(20, 3, 2, seed=0)
+    for _ in range(5):
+        population.mutate()
+    with tempfile.TemporaryDirectory() as directory:
+        # Saved before any Genome is hashed or compiled : the table must give the hashes of the Genome all the same
+        population.save(directory)
+        loaded = Population.load(directory)
+        hashes = loaded.content_hashes()
+        print("table hash == original hash :", hashes == [genome.content_hash() for genome in population.people])
+        print("table hash == decoded hash :", hashes == [genome.content_hash() for genome in loaded.people])
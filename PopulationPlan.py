@@ -0,0 +1,202 @@
+"""
+Compiled evaluation plan of a whole Population
+
+Created by Shinrod at 18/10/2026
+"""
+from Node import Node
+from Plan import Plan
+import numpy as np
+
+
+class PopulationPlan:
+    """
+    The Plan of every Genome of a Population packed in a few arrays.
+
+    Level k of every Plan is evaluated at once :
+    - the dense Layers (see Layer) are stacked in one weight tensor of shape (# genomes, # sources, # targets),
+      and evaluated with one batched matrix product. Padded sources point to Node 0 with a weight of 0,
+      padded targets write in an extra column that is never read.
+    - the sparse Layers keep their CSR arrays, concatenated one Genome after the other :
+      the weighted sums of all their targets are a single np.add.reduceat.
+    """
+
+    def __init__(self, plans):
+        """
+        Pack the Plans
+
+        :param plans: Plan of each Genome, they must all have the same # of inputs and outputs
+        """
+        self.plans = plans
+        self.n_inputs = plans[0].n_inputs
+        self.bias = plans[0].bias
+        if any(plan.n_inputs != self.n_inputs or len(plan.outputs) != len(plans[0].outputs) for plan in plans):
+            raise ValueError("All the genomes must have the same # of inputs and outputs")
+
+        # The extra column is written by the padded targets
+        self.n_nodes = max(len(plan.values) for plan in plans)
+        self.dummy = self.n_nodes
+        self.outputs = np.array([plan.outputs for plan in plans], dtype=np.int64)
+        # Value of every Node of every Genome, kept between two calls to 'step'
+        self.state = None
+
+        # (dense part, sparse part) of each level, see pack_dense() and pack_sparse()
+        self.layers = []
+        for level in range(max(len(plan.layers) for plan in plans)):
+            layers = [plan.layers[level] if level < len(plan.layers) else None for plan in plans]
+            self.layers.append((self.pack_dense([layer if layer is not None and not layer.sparse else None
+                                                 for layer in layers]),
+                                self.pack_sparse([layer if layer is not None and layer.sparse else None
+                                                  for layer in layers])))
+
+    def pack_dense(self, layers):
+        """
+        Stack dense Layers in padded arrays
+
+        :param layers: Layer of each Plan, or None
+
+        :return: (position of each Plan in the arrays or -1, targets, sources, matrix),
+                 or None if there is no Layer
+        """
+        position = np.full(len(layers), -1, dtype=np.int64)
+        packed = [i for i, layer in enumerate(layers) if layer is not None]
+        if not packed:
+            return None
+        position[packed] = np.arange(len(packed))
+        n_sources = max(len(layers[i].sources) for i in packed)
+        n_targets = max(len(layers[i].targets) for i in packed)
+
+        targets = np.full((len(packed), n_targets), self.dummy, dtype=np.int64)
+        sources = np.zeros((len(packed), n_sources), dtype=np.int64)
+        matrix = np.zeros((len(packed), n_sources, n_targets))
+        for k, i in enumerate(packed):
+            layer = layers[i]
+            targets[k, :len(layer.targets)] = layer.targets
+            sources[k, :len(layer.sources)] = layer.sources
+            matrix[k, :len(layer.sources), :len(layer.targets)] = layer.matrix
+        return position, targets, sources, matrix
+
+    @staticmethod
+    def pack_sparse(layers):
+        """
+        Concatenate the CSR arrays of sparse Layers
+
+        :param layers: Layer of each Plan, or None
+
+        :return: (position of each Plan in the arrays or -1, targets, indices, weights,
+                  where the Connections of each target begin, # of Connections of each target,
+                  where the Connections of each Plan begin, where the targets of each Plan begin),
+                 or None if there is no Layer
+        """
+        position = np.full(len(layers), -1, dtype=np.int64)
+        packed = [layers[i] for i in range(len(layers)) if layers[i] is not None]
+        if not packed:
+            return None
+        position[[i for i in range(len(layers)) if layers[i] is not None]] = np.arange(len(packed))
+        connections = np.cumsum([0] + [len(layer.indices) for layer in packed])
+        nodes = np.cumsum([0] + [len(layer.targets) for layer in packed])
+        starts = np.concatenate([layer.indptr[:-1] + offset for layer, offset in zip(packed, connections)])
+        counts = np.concatenate([np.diff(layer.indptr) for layer in packed])
+        return (position, np.concatenate([layer.targets for layer in packed]),
+                np.concatenate([layer.indices for layer in packed]), np.concatenate([layer.weights for layer in packed]),
+                starts, counts, connections, nodes)
+
+    # ----------------------------------------------- THINK ------------------------------------------------------------
+    def think_batch(self, inputs):
+        """
+        Evaluate every Plan on many samples at once
+
+        Like Plan.think_batch, the recurrent Connections read the values left by the last call to Plan.think.
+
+        :param inputs: array of shape (n_samples, # of inputs)
+
+        :return: array of shape (# genomes, n_samples, # of outputs)
+        """
+        inputs = np.asarray(inputs, dtype=np.float64)
+        values = np.zeros((len(self.plans), len(inputs), self.n_nodes + 1))
+        for i, plan in enumerate(self.plans):
+            values[i, :, :len(plan.values)] = plan.values
+        values[:, :, :self.n_inputs] = inputs
+        values[:, :, self.bias] = 1
+
+        self.evaluate(values, np.arange(len(self.plans)))
+        return np.take_along_axis(values, self.outputs[:, None, :], axis=2)
+
+    def step(self, inputs, rows=None):
+        """
+        Make one time step for some of the Plans, each with its own inputs and its own state
+
+        Like Plan.step, the recurrent Connections read the values of the previous step of the same Plan
+        (0 at the first step, or after reset()).
+
+        :param inputs: array of shape (len(rows), # of inputs)
+        :param rows: index of the stepped Plans in self.plans (default : all of them)
+
+        :return: array of shape (len(rows), # of outputs)
+        """
+        if self.state is None:
+            self.state = np.zeros((len(self.plans), self.n_nodes + 1))
+        rows = np.arange(len(self.plans)) if rows is None else np.asarray(rows, dtype=np.int64)
+        # One sample per Plan
+        values = self.state[rows][:, None, :]
+        values[:, 0, :self.n_inputs] = inputs
+        values[:, 0, self.bias] = 1
+
+        self.evaluate(values, rows)
+        self.state[rows] = values[:, 0]
+        return np.take_along_axis(values[:, 0], self.outputs[rows], axis=1)
+
+    def evaluate(self, values, rows):
+        """
+        Evaluate every level of some of the Plans
+
+        :param values: array (len(rows), n_samples, # of Nodes + 1) of the values of the Nodes of those Plans,
+                       the sensors must be set, the other Nodes are computed in place
+        :param rows: index of those Plans in self.plans
+
+        :return: None
+        """
+        samples = np.arange(values.shape[1])[None, :, None]
+        for dense, sparse in self.layers:
+            if dense is not None:
+                position, targets, sources, matrix = dense
+                found = position[rows]
+                selected = np.flatnonzero(found >= 0)
+                if len(selected):
+                    found = found[selected]
+                    gathered = values[selected[:, None, None], samples, sources[found][:, None, :]]
+                    values[selected[:, None, None], samples, targets[found][:, None, :]] = \
+                        Node.sigmoid(gathered @ matrix[found])
+
+            if sparse is not None:
+                position, targets, indices, weights, starts, counts, connections, nodes = sparse
+                found = position[rows]
+                selected = np.flatnonzero(found >= 0)
+                if len(selected):
+                    found = found[selected]
+                    n_connections = connections[found + 1] - connections[found]
+                    n_targets = nodes[found + 1] - nodes[found]
+                    kept = Plan.ranges(connections[found], connections[found + 1])
+                    computed = Plan.ranges(nodes[found], nodes[found + 1])
+
+                    products = values[np.repeat(selected, n_connections), :, indices[kept]] * weights[kept, None]
+                    # Where the Connections of each target begin in products
+                    shift = connections[found] - (np.cumsum(n_connections) - n_connections)
+                    begin = starts[computed] - np.repeat(shift, n_targets)
+                    nonempty = counts[computed] > 0
+                    sums = np.zeros((len(computed), values.shape[1]))
+                    if nonempty.any():
+                        sums[nonempty] = np.add.reduceat(products, begin[nonempty], axis=0)
+                    values[np.repeat(selected, n_targets), :, targets[computed]] = Node.sigmoid(sums)
+
+    def reset(self, rows=None):
+        """
+        Forget the state kept by 'step'
+
+        :param rows: index of the Plans to reset in self.plans (default : all of them)
+        """
+        if self.state is None:
+            return
+        if rows is None:
+            self.state = None
+        else:
+            self.state[rows] = 0
@@ -0,0 +1,152 @@
+"""
+Instrumentation of the hot paths of NEAT
+
+Created by Shinrod at 18/10/2026
+"""
+from functools import wraps
+from time import perf_counter
+
+
+class Profiler:
+    """
+    Count the calls, the wall time and the # of Nodes and Connections processed by the main methods.
+
+    While it is enabled, the methods listed in Profiler.hooks() are replaced by timed wrappers.
+    When it is disabled, the original methods are put back, so it costs nothing.
+
+    Use it like this :
+    with Profiler() as profiler:
+        for stats in population.run(...):
+            print(stats['profile'])
+    """
+
+    # The enabled Profiler, if any
+    active = None
+
+    def __init__(self):
+        """
+        Make a new, disabled, Profiler
+        """
+        # Name of the method -> [calls, time, nodes, connections]
+        self.stats = {}
+        self.originals = []
+
+    def enable(self):
+        """
+        Start recording
+
+        :return: None
+        """
+        if Profiler.active is not None:
+            raise RuntimeError("Another Profiler is already enabled")
+        Profiler.active = self
+        for cls, name, size in Profiler.hooks():
+            function = cls.__dict__[name]
+            self.originals.append((cls, name, function))
+            setattr(cls, name, self.wrap(cls.__name__ + '.' + name, function, size))
+
+    def disable(self):
+        """
+        Stop recording and put the original methods back
+
+        :return: None
+        """
+        for cls, name, function in reversed(self.originals):
+            setattr(cls, name, function)
+        self.originals = []
+        Profiler.active = None
+
+    def report(self, reset : bool = True):
+        """
+        Structured report of what has been recorded
+
+        :param reset: if True, start a new record (to get a report per generation)
+
+        :return: dict name of the method -> dict of calls, time (s), nodes and connections processed
+        """
+        report = {name: {'calls': calls, 'time': time, 'nodes': nodes, 'connections': connections}
+                  for name, (calls, time, nodes, connections) in self.stats.items() if calls}
+        if reset:
+            for stats in self.stats.values():
+                stats[:] = [0, 0.0, 0, 0]
+        return report
+
+    def wrap(self, name, function, size):
+        """
+        Make a timed wrapper of a method
+
+        :param name: name of the method in the report
+        :param function: the method
+        :param size: function (self, args, result) -> (# Nodes, # Connections) processed by the call
+
+        :return: the wrapper
+        """
+        stats = self.stats.setdefault(name, [0, 0.0, 0, 0])
+
+        @wraps(function)
+        def wrapper(obj, *args, **kwargs):
+            start = perf_counter()
+            result = function(obj, *args, **kwargs)
+            stats[1] += perf_counter() - start
+            stats[0] += 1
+            nodes, connections = size(obj, args, result)
+            stats[2] += nodes
+            stats[3] += connections
+            return result
+        return wrapper
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    # ------------------------------------------------ SIZE ------------------------------------------------------------
+    @staticmethod
+    def hooks():
+        """
+        The instrumented methods
+
+        :return: list of (class, name of the method, size function)
+        """
+        from Genome import Genome
+        from Population import Population
+        return [(Genome, 'think', Profiler.plan_size),
+                (Genome, 'think_batch', Profiler.batch_plan_size),
+                (Genome, 'mutate', Profiler.genome_size),
+                (Genome, 'mutation_add_connection', Profiler.genome_size),
+                (Genome, 'mutation_add_node', Profiler.genome_size),
+                (Genome, 'clone', Profiler.genome_size),
+                (Population, 'evaluate', Profiler.population_plan_size),
+                (Population, 'evaluate_parallel', Profiler.population_size),
+                (Population, 'evaluate_stream', Profiler.population_size),
+                (Population, 'mutate', Profiler.population_size),
+                (Population, 'speciate', Profiler.population_size),
+                (Population, 'crossover', Profiler.population_size)]
+
+    @staticmethod
+    def genome_size(genome, args, result):
+        return (len(genome.input) + 1 + len(genome.hidden) + len(genome.output),
+                len(genome.standard_connections) + len(genome.bias_connections))
+
+    @staticmethod
+    def plan_size(genome, args, result):
+        return len(genome.plan.order), len(genome.plan.sources)
+
+    @staticmethod
+    def batch_plan_size(genome, args, result):
+        # Nodes and Connections evaluated, for every sample
+        return len(result) * len(genome.plan.order), len(result) * len(genome.plan.sources)
+
+    @staticmethod
+    def population_plan_size(population, args, result):
+        samples = result.shape[1]
+        plans = population.plan.plans
+        return (samples * sum(len(plan.order) for plan in plans),
+                samples * sum(len(plan.sources) for plan in plans))
+
+    @staticmethod
+    def population_size(population, args, result):
+        return (sum(len(genome.input) + 1 + len(genome.hidden) + len(genome.output) for genome in population.people),
+                sum(len(genome.standard_connections) + len(genome.bias_connections) for genome in population.people))
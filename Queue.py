@@ -3,53 +3,71 @@ A custom queue
 
 Created by Shinrod at 06/07/2018
 """
+from heapq import heappush, heappop
+from itertools import count
+
 
 class PriorityQueue:
     """
     Priority queue where the element with the highest priority leaves first
+
+    It is a binary heap with lazy deletion : putting an item that is already in the queue
+    marks its old entry as removed, and the removed entries are skipped by get().
+    Items are identified by their identity (id), so two distinct items never merge.
     """
 
     def __init__(self):
         """
         Make a new Priority Queue
         """
-        # self.queue contains the items
-        self.queue = []
-        self.priority = {}
+        # self.heap contains the entries [-priority, age, item, removed]
+        self.heap = []
+        # self.entries maps id(item) to the live entry of that item
+        self.entries = {}
+        self.counter = count()
 
     def put(self, item, priority):
         """
         Put an item in the queue
 
+        If the item is already in the queue, its priority is updated and it becomes the newest item.
+
         :param item: Item you put in the queue
         :param priority: Priority of the item in the queue (Higher priority is taken first)
         """
-        if item in self.queue:
-            self.queue.remove(item)
-        self.queue.append(item)
-        self.priority[str(item)] = priority
+        old_entry = self.entries.get(id(item))
+        if old_entry is not None:
+            old_entry[3] = True
+        entry = [-priority, next(self.counter), item, False]
+        self.entries[id(item)] = entry
+        heappush(self.heap, entry)
 
     def get(self):
         """
         Return the item with the highest priority
         If two elements have the same priority, the oldest is chosen
         """
-        priorityMax = self.priority[str(self.queue[0])]
-        index = 0
-        for i, item in enumerate(self.queue[1:]):
-            if self.priority[str(item)] > priorityMax:
-                priorityMax = self.priority[str(item)]
-                index = i+1
-        return self.queue.pop(index)
+        while self.heap:
+            _, _, item, removed = heappop(self.heap)
+            if not removed:
+                del self.entries[id(item)]
+                return item
+        raise IndexError("get from an empty PriorityQueue")
 
     def empty(self):
         """
         Tell if the queue is empty or not
         """
-        return len(self.queue) == 0
+        return len(self.entries) == 0
+
+    def __len__(self):
+        """
+        # of items in the queue
+        """
+        return len(self.entries)
 
     def __bool__(self):
         """
         Like python list, returns False if it's empty
         """
-        return not self.empty()
\ No newline at end of file
+        return not self.empty()
@@ -0,0 +1,26 @@
+"""
+Species gathering similar genomes
+
+Created by Shinrod at 18/10/2026
+"""
+
+
+class Species:
+    """
+    Group of Genome close to each other according to the compatibility distance
+
+    As described in http://nn.cs.utexas.edu/downloads/papers/stanley.ec02.pdf (3.3)
+    """
+
+    def __init__(self, innovations, weights):
+        """
+        Make a new Species
+
+        The representative is stored as arrays, so that mutating its Genome doesn't change the Species.
+
+        :param innovations: sorted innovation numbers of the representative
+        :param weights: weights of the representative
+        """
+        self.innovations = innovations
+        self.weights = weights
+        self.members = []
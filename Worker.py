@@ -0,0 +1,67 @@
+"""
+Entry point of the evaluation processes
+
+A process started by Population.evaluate_parallel() imports this module to run its tasks.
+It only needs NumPy : Genome (and the Node / Connection graph behind it) is imported by the first task that
+rebuilds a Genome, so a process evaluating exported Network never imports it.
+
+Created by Shinrod at 18/10/2026
+"""
+import numpy as np
+
+
+class Worker:
+    """
+    Tasks run by the evaluation processes, they must be picklable so they are static methods.
+    """
+
+    @staticmethod
+    def evaluate_code(fitness_fn, seed, config, index, code):
+        """
+        Rebuild an encoded Genome and compute its fitness
+
+        Used by :
+        Population.evaluate_parallel()
+
+        :param fitness_fn: function (Genome) -> fitness
+        :param seed: seed of np.random, or None
+        :param config: Config of the Population
+        :param index: index of the Genome in the Population
+        :param code: CompactGenome made by Genome.encode()
+
+        :return: the fitness of the Genome
+        """
+        from Genome import Genome
+        Worker.seed(seed, index)
+        return fitness_fn(Genome.decode(code, config))
+
+    @staticmethod
+    def evaluate_network(fitness_fn, seed, index, network):
+        """
+        Compute the fitness of an exported Genome
+
+        Used by :
+        Population.evaluate_parallel()
+
+        :param fitness_fn: function (Network) -> fitness
+        :param seed: seed of np.random, or None
+        :param index: index of the Genome in the Population
+        :param network: Network made by Genome.export()
+
+        :return: the fitness of the Genome
+        """
+        Worker.seed(seed, index)
+        return fitness_fn(network)
+
+    @staticmethod
+    def seed(seed, index):
+        """
+        Seed np.random for the evaluation of one Genome, so that it doesn't depend on the process evaluating it
+
+        :param seed: seed given to Population.evaluate_parallel(), or None to leave np.random as it is
+        :param index: index of the Genome in the Population
+
+        :return: None
+        """
+        if seed is not None:
+            np.random.seed(np.random.SeedSequence((seed, index)).generate_state(1))